@@ -3,10 +3,13 @@
 import os
 from pathlib import Path
 import shutil
+import voluptuous as vol
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.components import frontend
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from .mqtt_profile_manager import ProfileManager
 from . import websocket_api
@@ -15,6 +18,29 @@ from .const import *
 import logging
 _LOGGER = logging.getLogger(__name__)
 
+ADD_OVERRIDE_SCHEMA = vol.Schema({
+    vol.Exclusive("zone", "target"): cv.string,
+    vol.Exclusive("profile", "target"): cv.string,
+    vol.Required("type"): vol.In(OVERRIDE_TYPES),
+    vol.Required("start"): cv.datetime,
+    vol.Required("end"): cv.datetime,
+    vol.Optional("temperature"): vol.Coerce(float),
+})
+
+REMOVE_OVERRIDE_SCHEMA = vol.Schema({
+    vol.Required("id"): cv.string,
+})
+
+SET_ZONES_SCHEMA = vol.Schema({
+    vol.Optional("zones"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("mode"): vol.In(HEATER_MODES),
+    vol.Optional("present"): cv.boolean,
+    vol.Optional("manual_temp"): vol.Coerce(float),
+    vol.Optional("boost"): cv.boolean,
+    vol.Optional("profile"): cv.string,
+})
+SET_ZONES_FIELDS = ("mode", "present", "manual_temp", "boost", "profile")
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
@@ -64,6 +90,71 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         handle_force_update
     )
     
+    # Register services for date-range overrides
+    async def handle_add_override(call: ServiceCall):
+        """Add an absence, holiday or fixed temperature for a zone or profile."""
+        zone_id = call.data.get("zone")
+        profile = call.data.get("profile")
+        override_type = call.data["type"]
+        start = _to_local_naive(call.data["start"])
+        end = _to_local_naive(call.data["end"])
+        temp = call.data.get("temperature")
+        
+        if not zone_id and not profile:
+            raise ServiceValidationError("Either zone or profile is required")
+        if zone_id and zone_id not in entry.options.get("zones", {}):
+            raise ServiceValidationError(f"Unknown zone: {zone_id}")
+        if end <= start:
+            raise ServiceValidationError("End must be after start")
+        if override_type == OverrideType.TEMPERATURE and temp is None:
+            raise ServiceValidationError("Temperature is required for type temperature")
+        
+        return profile_manager.add_override(override_type, start, end, zone_id, profile, temp)
+    
+    async def handle_remove_override(call: ServiceCall):
+        """Remove an override by id."""
+        if not profile_manager.remove_override(call.data["id"]):
+            raise ServiceValidationError(f"Unknown override: {call.data['id']}")
+    
+    async def handle_list_overrides(call: ServiceCall):
+        """List all stored overrides."""
+        return {"overrides": [ov.as_dict() for ov in profile_manager.overrides.overrides.values()]}
+    
+    # Register service to set many zones with one recalculation
+    async def handle_set_zones(call: ServiceCall):
+        """Set mode, presence, manual temp, boost and profile of many zones at once."""
+        configured = entry.options.get("zones", {})
+        zone_ids = call.data.get("zones") or list(configured)
+        unknown = [zone_id for zone_id in zone_ids if zone_id not in configured]
+        if unknown:
+            raise ServiceValidationError(f"Unknown zones: {', '.join(unknown)}")
+        
+        values = {field: call.data[field] for field in SET_ZONES_FIELDS if field in call.data}
+        if not values:
+            raise ServiceValidationError(f"At least one of {', '.join(SET_ZONES_FIELDS)} is required")
+        
+        try:
+            return await profile_manager.set_zones({zone_id: values for zone_id in zone_ids})
+        except ValueError as e:
+            raise ServiceValidationError(str(e)) from e
+    
+    hass.services.async_register(
+        DOMAIN, "add_override", handle_add_override,
+        schema=ADD_OVERRIDE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, "remove_override", handle_remove_override,
+        schema=REMOVE_OVERRIDE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "list_overrides", handle_list_overrides,
+        supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        DOMAIN, "set_zones", handle_set_zones,
+        schema=SET_ZONES_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    
     # Update listener for option update
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     
@@ -77,8 +168,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if manager:
         await manager.stop()
     
-    # remove service
+    # remove services
     hass.services.async_remove(DOMAIN, "force_update")
+    hass.services.async_remove(DOMAIN, "add_override")
+    hass.services.async_remove(DOMAIN, "remove_override")
+    hass.services.async_remove(DOMAIN, "list_overrides")
+    hass.services.async_remove(DOMAIN, "set_zones")
     
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
@@ -155,6 +250,13 @@ async def async_remove_config_entry_device(
     return True
 
 
+def _to_local_naive(value):
+    """Service datetimes may be aware, the manager works with local time."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
 async def _copy_mqtt_js(hass: HomeAssistant) -> None:
     """Copy paho-mqtt.js to www folder."""
     try:
@@ -0,0 +1,127 @@
+# /config/custom_components/heatzone/aggregator.py
+
+import statistics
+from typing import Callable, Dict, Optional
+
+TRIM_MAD_FACTOR = 3.0     # outlier: further than 3 median deviations from the median
+
+
+def _trimmed(values: list) -> float:
+    """Mean without outliers (median absolute deviation)."""
+    if len(values) < 3:
+        return statistics.fmean(values)
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    if mad == 0:
+        return median
+    kept = [v for v in values if abs(v - median) <= TRIM_MAD_FACTOR * mad]
+    return statistics.fmean(kept)
+
+
+# reducer: fn(values) -> value
+REDUCERS: Dict[str, Callable[[list], float]] = {
+    "mean": statistics.fmean,
+    "median": statistics.median,
+    "min": min,
+    "max": max,
+    "trimmed": _trimmed,
+}
+
+
+class SourceAggregator:
+    """Latest value per source entity, reduced to one value.
+
+    Sources are updated by their own state change events only; the reduced
+    value is cached until a source changes or goes stale. Times are
+    timestamps in seconds.
+
+    The age of a source is the time since its last_updated, i.e. since its
+    value or attributes last changed. A sensor that keeps reporting the same
+    value does not refresh it, so max_age must be longer than the time such
+    a sensor can stay unchanged.
+    """
+
+    __slots__ = ("reducer", "max_age", "_parse", "_values", "_result", "_valid_until")
+
+    def __init__(self, reducer: str = "mean", parse: Callable[[str], Optional[float]] = float,
+                 max_age: Optional[float] = None):
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown reducer {reducer}")
+        self.reducer = reducer
+        self.max_age = max_age              # None: sources never go stale
+        self._parse = parse
+        self._values: Dict[str, tuple] = {} # {entity_id: (value, updated)}, only valid values
+        self._result: Optional[float] = None
+        self._valid_until: Optional[float] = 0.0  # None: cached result valid until a change
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def sources(self) -> list:
+        return list(self._values)
+
+    @property
+    def valid_until(self) -> Optional[float]:
+        """Time the next source goes stale, None if none does."""
+        return self._valid_until
+
+    def set_max_age(self, max_age: Optional[float]):
+        """Changes the age after which sources are ignored."""
+        if max_age != self.max_age:
+            self.max_age = max_age
+            self._valid_until = 0.0
+
+    def set_reducer(self, reducer: str):
+        """Changes how the values of the sources are reduced."""
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown reducer {reducer}")
+        if reducer != self.reducer:
+            self.reducer = reducer
+            self._valid_until = 0.0
+
+    def set_sources(self, states: dict):
+        """Replaces all sources, {entity_id: State or None}."""
+        self._values = {}
+        for entity_id, state in states.items():
+            self.update(entity_id, state)
+
+    def update(self, entity_id: str, state) -> bool:
+        """New state of a source, True if its value changed."""
+        value = None
+        if state is not None and state.state not in ("unknown", "unavailable", ""):
+            try:
+                value = self._parse(state.state)
+            except (ValueError, TypeError):
+                value = None
+
+        old = self._values.get(entity_id)
+        if value is None:
+            if old is None:
+                return False
+            del self._values[entity_id]
+        else:
+            self._values[entity_id] = (value, state.last_updated.timestamp())
+            if old is not None and old[0] == value:
+                return False
+        self._valid_until = 0.0
+        return True
+
+    def value(self, now: float) -> Optional[float]:
+        """Reduced value of all fresh sources, None without any."""
+        if self._valid_until is None or now < self._valid_until:
+            return self._result
+
+        values = []
+        oldest = None
+        for value, updated in self._values.values():
+            if self.max_age is not None:
+                if now - updated > self.max_age:
+                    continue
+                oldest = updated if oldest is None else min(oldest, updated)
+            values.append(value)
+
+        self._result = REDUCERS[self.reducer](values) if values else None
+        # cached until the next source goes stale
+        self._valid_until = oldest + self.max_age if oldest is not None else None
+        return self._result
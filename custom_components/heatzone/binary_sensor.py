@@ -26,6 +26,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry,
     
     entities.append(GlobalHeatingBinarySensor(hass, entry))
 
+    # heating circuits (on the global device)
+    for circuit_id, circuit in entry.options.get("circuits", {}).items():
+        entities.append(CircuitHeatingBinarySensor(hass, entry, circuit_id, circuit.get("name", circuit_id)))
+
     for zone_id in zones:
         entities.append(ZoneWindowContactBinarySensor(hass, entry, zone_id))
 
@@ -75,6 +79,51 @@ class GlobalHeatingBinarySensor(ZoneEntityCore, BinarySensorEntity):
             self._unsub_dispatcher()
         await super().async_will_remove_from_hass()
 
+# -----------------------------------------------------------------------------
+# ANCHOR - heating circuit binary sensor
+# -----------------------------------------------------------------------------
+
+class CircuitHeatingBinarySensor(ZoneEntityCore, BinarySensorEntity):
+    """Heating demand of one heating circuit."""
+    
+    _attr_device_class = "heat"
+    _attr_is_global = True
+    _attr_use_translation = False
+    _update_temps = False
+    
+    def __init__(self, hass, entry, circuit_id: str, circuit_name: str):
+        self._circuit_id = circuit_id
+        self._attr_unique_suffix = f"circuit_{circuit_id}_heating"
+        self._attr_name_suffix = f"{circuit_name} Heating"
+        super().__init__(hass, entry)
+        self._unsub_dispatcher = None
+    
+    async def async_added_to_hass(self):
+        """Subscribe to dispatcher signals."""
+        await super().async_added_to_hass()
+        
+        @callback
+        def _handle_circuit_update():
+            circuit = self._manager.circuits.get(self._circuit_id) if self._manager else None
+            if circuit and circuit.demand != self._attr_is_on:
+                self._attr_is_on = circuit.demand
+                self.async_write_ha_state()
+        
+        self._attr_is_on = None
+        _handle_circuit_update()
+        
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            f"{DOMAIN}_circuit_update_{self._circuit_id}",
+            _handle_circuit_update
+        )
+    
+    async def async_will_remove_from_hass(self):
+        """Unsubscribe from dispatcher."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+        await super().async_will_remove_from_hass()
+
 # -----------------------------------------------------------------------------
 # ANCHOR - Base class that reflects the value from a Select-bound sensor
 # -----------------------------------------------------------------------------
@@ -82,19 +131,25 @@ class GlobalHeatingBinarySensor(ZoneEntityCore, BinarySensorEntity):
 class ZoneMirrorBinarySensorBase(ZoneMirrorEntityBase, BinarySensorEntity):
     """Base class that reflects the value from a Select-bound sensor."""
 
-    def _get_mirrored_value(self, target_state) -> bool:
-        """For BinarySensors: Converts state to boolean."""
-        return target_state.state in (STATE_ON, "open")
+    _attr_reducer_setting = "window_reducer"
+    
+    @staticmethod
+    def _parse_source_state(state: str) -> float:
+        return 1.0 if state in (STATE_ON, "open") else 0.0
+    
+    def _get_mirrored_value(self, value: float) -> bool:
+        """For BinarySensors: Converts the aggregated value to boolean."""
+        return value > 0
     
     @property
     def is_on(self) -> bool:
         """Return true if window is open."""
-        target_state = self._get_target_state()
-        if not target_state:
+        value = self._get_aggregated_value()
+        if value is None:
             self._manager.on_window_closed(self._zone_id)
             return False
         
-        is_open = self._get_mirrored_value(target_state)
+        is_open = self._get_mirrored_value(value)
         
         if is_open:
             self._manager.on_window_opened(self._zone_id)
@@ -54,25 +54,15 @@ class GlobalSetAllModeButton(ZoneEntityCore, ButtonEntity):
     async def async_press(self) -> None:
         """Handle button press - set all zones to the specified mode."""
         zones = self._config_entry.options.get("zones", {})
-        success_count = 0
         
         _LOGGER.info(f"Button pressed: Setting all zones to mode '{self._mode.value}'")
         
-        for zone_id in zones:
-            select_entity_id = f"select.{zone_id}_mode"
-            
-            state = self.hass.states.get(select_entity_id)
-            if state:
-                await self.hass.services.async_call(
-                    "select",
-                    "select_option",
-                    {
-                        "entity_id": select_entity_id,
-                        "option": self._mode.value, 
-                    },
-                )
-                success_count += 1
-            else:
-                _LOGGER.warning(f"Mode select for {zone_id} not found: {select_entity_id}")
+        # all zones in one batch, recalculated once
+        await self.hass.services.async_call(
+            DOMAIN,
+            "set_zones",
+            {"zones": list(zones), "mode": self._mode.value},
+            blocking=True,
+        )
         
-        _LOGGER.info(f"Successfully set {success_count}/{len(zones)} zones to '{self._mode.value}' mode")
\ No newline at end of file
+        _LOGGER.info(f"Successfully set {len(zones)} zones to '{self._mode.value}' mode")
\ No newline at end of file
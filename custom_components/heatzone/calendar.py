@@ -0,0 +1,125 @@
+# /config/custom_components/heatzone/calendar.py
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_state_change_event
+from .entity import ZoneEntityCore
+from .const import *
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Setup
+# -----------------------------------------------------------------------------
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry,
+                            async_add_entities: AddEntitiesCallback) -> None:
+    """Set up calendar entities for all zones."""
+    zones = entry.options.get("zones", {})
+    entities: list[CalendarEntity] = []
+
+    for zone_id in zones:
+        entities.append(ZoneScheduleCalendar(hass, entry, zone_id))
+
+    _LOGGER.debug("Setting up %d calendar entities for %d zones", len(entities), len(zones))
+    async_add_entities(entities)
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Zone schedule calendar
+# -----------------------------------------------------------------------------
+
+class ZoneScheduleCalendar(ZoneEntityCore, CalendarEntity):
+    """Weekly schedule of the zone profile as calendar events."""
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_unique_suffix = "schedule"
+    _attr_name_suffix = "Schedule"
+
+    def __init__(self, hass, entry, zone_id: str):
+        super().__init__(hass, entry, zone_id)
+        self._profile_entity_id = f"text.{zone_id}_profile"
+        self._unsub_profile = None
+        self._unsub_text = None
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh when the profile data or the profile name changes."""
+        await super().async_added_to_hass()
+
+        @callback
+        def _on_profile_update(topic: str):
+            if self._manager and topic == self._manager.get_topic(self._zone_id):
+                self.async_write_ha_state()
+
+        @callback
+        def _on_profile_name_changed(event):
+            self.async_write_ha_state()
+
+        self._unsub_profile = async_dispatcher_connect(
+            self.hass, f"{DOMAIN}_profile_update", _on_profile_update)
+        self._unsub_text = async_track_state_change_event(
+            self.hass, [self._profile_entity_id], _on_profile_name_changed)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Remove all listeners."""
+        if self._unsub_profile:
+            self._unsub_profile()
+            self._unsub_profile = None
+        if self._unsub_text:
+            self._unsub_text()
+            self._unsub_text = None
+
+    def _get_profile(self):
+        """Get the compiled profile of the zone."""
+        if not self._manager:
+            return None
+        topic = self._manager.get_topic(self._zone_id)
+        profile = self._manager.profiles.get(topic) if topic else None
+        if not profile or not profile.is_complete():
+            return None
+        return profile
+
+    def _get_events(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Events between two local times."""
+        profile = self._get_profile()
+        if not profile:
+            return []
+
+        events = []
+        for period_start, period_end, temp_id in profile.get_periods(start, end):
+            events.append(CalendarEvent(
+                start=period_start.astimezone(),
+                end=period_end.astimezone(),
+                summary=self._get_summary(profile, temp_id),
+                description=profile.topic,
+            ))
+        return events
+
+    @staticmethod
+    def _get_summary(profile, temp_id: int) -> str:
+        """Event title from the TempID."""
+        if temp_id == TEMP_ID_OFF:
+            return f"Off ({TEMP_OFF}°C)"
+        if 1 <= temp_id <= 4:
+            return f"Temp{temp_id} ({profile.get_temp_by_id(temp_id)}°C)"
+        return "Bypass"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """The current or next event."""
+        now = datetime.now()
+        events = self._get_events(now, now + timedelta(days=8))
+        return events[0] if events else None
+
+    async def async_get_events(self, hass: HomeAssistant, start_date: datetime,
+                               end_date: datetime) -> list[CalendarEvent]:
+        """Events in a time range."""
+        # compiled schedule works with local naive times
+        start = start_date.astimezone().replace(tzinfo=None)
+        end = end_date.astimezone().replace(tzinfo=None)
+        return self._get_events(start, end)
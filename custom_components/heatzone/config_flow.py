@@ -57,7 +57,7 @@ class HeatzoneOptionsFlow(config_entries.OptionsFlow):
         """Main-Menue."""
         return self.async_show_menu(
             step_id="init",
-            menu_options=["add_zone", "mqtt_settings" ]
+            menu_options=["add_zone", "add_circuit", "assign_circuit", "mqtt_settings" ]
             # menu_options={"add_zone": "Add new zone", "mqtt_settings": "MQTT-Settings"}
         )
     
@@ -95,6 +95,69 @@ class HeatzoneOptionsFlow(config_entries.OptionsFlow):
         
         return self.async_show_form( step_id="add_zone", data_schema=schema )
     
+    async def async_step_add_circuit(self, user_input=None):
+        """Add new heating circuit."""
+        schema = vol.Schema({
+            vol.Required("name"): str,
+            vol.Optional("hysteresis", default=DEFAULT_HYSTERESIS): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=3.0)),
+        })
+        
+        if user_input is not None:
+            circuit_name = user_input["name"]
+            circuit_id = circuit_name.lower().replace(' ', '_').replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue').replace('ß', 'ss')
+            
+            circuits = dict(self.config_entry.options.get("circuits", {}))
+            
+            # check if circuit exists
+            if circuit_id in circuits:
+                return self.async_show_form(
+                    step_id="add_circuit",
+                    data_schema=schema,
+                    errors={"name": "circuit_exists"}
+                )
+            
+            circuits[circuit_id] = {"name": circuit_name, "hysteresis": user_input["hysteresis"]}
+            
+            # keep all existing options!
+            new_options = dict(self.config_entry.options)
+            new_options["circuits"] = circuits
+            return self.async_create_entry(title="", data=new_options)
+        
+        return self.async_show_form(step_id="add_circuit", data_schema=schema)
+    
+    async def async_step_assign_circuit(self, user_input=None):
+        """Assign a zone to a heating circuit."""
+        zones = self.config_entry.options.get("zones", {})
+        circuits = self.config_entry.options.get("circuits", {})
+        
+        if not zones or not circuits:
+            return self.async_abort(reason="no_circuits")
+        
+        if user_input is not None:
+            zone_id = user_input["zone"]
+            circuit_id = user_input["circuit"]
+            
+            new_zones = dict(zones)
+            zone = dict(new_zones[zone_id])
+            if circuit_id:
+                zone["circuit"] = circuit_id
+            else:
+                zone.pop("circuit", None)
+            new_zones[zone_id] = zone
+            
+            # keep all existing options!
+            new_options = dict(self.config_entry.options)
+            new_options["zones"] = new_zones
+            return self.async_create_entry(title="", data=new_options)
+        
+        schema = vol.Schema({
+            vol.Required("zone"): vol.In({zone_id: zone.get("name", zone_id) for zone_id, zone in zones.items()}),
+            vol.Optional("circuit", default=""): vol.In(
+                {"": "-", **{circuit_id: circuit.get("name", circuit_id) for circuit_id, circuit in circuits.items()}}),
+        })
+        return self.async_show_form(step_id="assign_circuit", data_schema=schema)
+    
     async def async_step_mqtt_settings(self, user_input=None):
         """Edit MQTT settings."""
         
@@ -107,6 +170,7 @@ class HeatzoneOptionsFlow(config_entries.OptionsFlow):
                 "mqtt_websocket_port": user_input.get("mqtt_websocket_port", MQTT_WEBSOCKET_PORT),
                 "mqtt_user": user_input.get("mqtt_user", MQTT_USER),
                 "mqtt_password": user_input.get("mqtt_password", MQTT_PASSWORD),
+                "mqtt_subscribe_all": user_input.get("mqtt_subscribe_all", False),
             }
             
             self.hass.config_entries.async_update_entry(
@@ -124,6 +188,7 @@ class HeatzoneOptionsFlow(config_entries.OptionsFlow):
             vol.Optional("mqtt_password", default=self.config_entry.data.get("mqtt_password", MQTT_PASSWORD)): selector.TextSelector(
                 selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD)
             ),
+            vol.Optional("mqtt_subscribe_all", default=self.config_entry.data.get("mqtt_subscribe_all", False)): bool,
         })
         
         return self.async_show_form(step_id="mqtt_settings", data_schema=schema)
\ No newline at end of file
@@ -5,7 +5,7 @@ from enum import StrEnum
 DOMAIN = "heatzone"
 DEFAULT_NAME = "HeatZone"
 
-PLATFORMS = ["number", "switch", "select", "text", "sensor", "binary_sensor", "button"] 
+PLATFORMS = ["number", "switch", "select", "text", "sensor", "binary_sensor", "button", "calendar"] 
 
 GLOBAL_DEVICE_NAME = "Global"
 GLOBAL_DEVICE_ID = "global"
@@ -34,9 +34,28 @@ class HeaterExtendedMode(StrEnum):
     BYPASS = "bypass"
     AWAY = "away"
 
+class OverrideType(StrEnum):
+    ABSENT = "absent"
+    HOLIDAY = "holiday"
+    TEMPERATURE = "temperature"
+
+class WindowState(StrEnum):
+    CLOSED = "closed"
+    OPENING = "opening"     # debounce before an open counts
+    OPEN = "open"           # lockout (zone delay) before 0°C
+    APPLIED = "applied"     # 0°C sent
+    CLOSING = "closing"     # minimum closed time before restoring
+
 HEATER_MODES = [mode.value for mode in HeaterMode]
+OVERRIDE_TYPES = [override_type.value for override_type in OverrideType]
+
+OVERRIDES_STORAGE_KEY = f"{DOMAIN}.overrides"
+OVERRIDES_STORAGE_VERSION = 1
+DEADLINES_STORAGE_KEY = f"{DOMAIN}.deadlines"
+DEADLINES_STORAGE_VERSION = 1
 
 PREFIX_TOPIC = "heatzone/profiles/"
+PROFILES_WILDCARD = f"{PREFIX_TOPIC}#"
 
 TEMP_BYPASS = -1.0
 TEMP_OFF = 0.0
@@ -44,12 +63,28 @@ TEMP_FALLBACK = -1.0
 MAX_RETRYS = 12
 CLEANUP_TIMEOUT_MINUTES = 10
 DEFAULT_CURRENT_TEMP = 25.0
+UPDATE_DEBOUNCE_SECONDS = 0.25     # collects bursts of entity updates
+DEFAULT_HYSTERESIS = 0.5
+DEMAND_FULL_SCALE = 3.0            # weighted mean deficit (°C) for 100 % modulation
+WINDOW_RESEND_PERIOD_SECONDS = 3600  # window re-send cap counts per hour
 
 # Feste Sub-Topics für Profile
 PROFILE_SUBTOPICS = [
     "Temp1", "Temp2", "Temp3", "Temp4", "TempAway", "TempHoliday",
     "Day1", "Day2", "Day3", "Day4", "Day5", "Day6", "Day7",
-    "Activated"]
+    "Activated", "Base"]
+
+# Profile name of a base profile; missing sub-topics are inherited from it
+BASE_SUBTOPIC = "Base"
 
 REQIRED_SUBTOPICS = ["Temp1", "Temp2", "Temp3", "Temp4", "TempAway", "TempHoliday", 
     "Day1", "Day2", "Day3", "Day4", "Day5", "Day6", "Day7"]
+
+TEMP_SUBTOPICS = ["Temp1", "Temp2", "Temp3", "Temp4", "TempAway", "TempHoliday"]
+DAY_SUBTOPICS = ["Day1", "Day2", "Day3", "Day4", "Day5", "Day6", "Day7"]
+
+# Compiled day schedules: one TempID per minute
+SLOTS_PER_DAY = 1440
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+TEMP_ID_OFF = 5         # TempID for 0°C
+TEMP_ID_NONE = 255      # no period matches this minute
@@ -0,0 +1,161 @@
+# /config/custom_components/heatzone/demand.py
+
+import math
+from typing import Dict, Optional
+import numpy as np
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+
+class DemandEngine:
+    """Zone targets, actual temperatures and priorities in contiguous arrays.
+
+    Zones are written one by one in O(1); compute() derives all demand
+    figures in one vectorized pass.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self._index: Dict[str, int] = {}    # {zone_id: row}
+        self._zone_ids: list = []           # [zone_id] per row
+        self.targets = np.zeros(capacity)
+        self.actuals = np.zeros(capacity)
+        self.priorities = np.zeros(capacity)
+
+    def __len__(self) -> int:
+        return len(self._zone_ids)
+
+    def _grow(self):
+        capacity = len(self.targets) * 2
+        for name in ("targets", "actuals", "priorities"):
+            array = np.zeros(capacity)
+            array[:len(self)] = getattr(self, name)[:len(self)]
+            setattr(self, name, array)
+
+    def set_zone(self, zone_id: str, target: float, actual: float, priority: float):
+        """Stores the current values of a zone."""
+        row = self._index.get(zone_id)
+        if row is None:
+            if len(self) == len(self.targets):
+                self._grow()
+            row = len(self)
+            self._index[zone_id] = row
+            self._zone_ids.append(zone_id)
+        self.targets[row] = target
+        self.actuals[row] = actual
+        self.priorities[row] = priority
+
+    def remove_zone(self, zone_id: str):
+        """Removes a zone, the last row takes its place."""
+        row = self._index.pop(zone_id, None)
+        if row is None:
+            return
+        last = len(self) - 1
+        last_zone = self._zone_ids.pop()
+        if row != last:
+            self._zone_ids[row] = last_zone
+            self._index[last_zone] = row
+            for array in (self.targets, self.actuals, self.priorities):
+                array[row] = array[last]
+
+    def compute(self, full_scale: float) -> dict:
+        """Weighted mean, max deficit, percentiles, calling zones and modulation.
+
+        Zones with priority 0 do not take part. full_scale is the weighted
+        mean deficit in °C that means 100 % modulation.
+        """
+        count = len(self)
+        priorities = self.priorities[:count]
+        active = priorities > 0
+        deficits = np.maximum(self.targets[:count] - self.actuals[:count], 0.0)[active]
+        weights = priorities[active]
+
+        if not deficits.size:
+            return {
+                "weighted_mean": 0.0, "max_deficit": 0.0, "deficit_p50": 0.0,
+                "deficit_p90": 0.0, "calling_zones": 0, "modulation": 0,
+            }
+
+        weighted_mean = float(np.dot(weights, deficits) / weights.sum())
+        p50, p90 = np.percentile(deficits, [50, 90])
+        modulation = min(100.0, 100.0 * weighted_mean / full_scale) if full_scale > 0 else 0.0
+        return {
+            "weighted_mean": round(weighted_mean, 1),
+            "max_deficit": round(float(deficits.max()), 1),
+            "deficit_p50": round(float(p50), 1),
+            "deficit_p90": round(float(p90), 1),
+            "calling_zones": int(np.count_nonzero(deficits)),
+            "modulation": int(round(modulation)),
+        }
+
+
+class DemandGroup:
+    """Demand of a group of zones (all zones or one heating circuit).
+
+    Keeps the zone contributions with running sums of prio * diff and prio,
+    the demand engine and the hysteresis state of the group.
+    """
+
+    def __init__(self, group_id: str, name: str, hysteresis: Optional[float] = None,
+                 full_scale: float = 3.0):
+        self.group_id = group_id
+        self.name = name
+        self.hysteresis = hysteresis        # None: global hysteresis setting
+        self.full_scale = full_scale
+        self.contributions: Dict[str, tuple] = {}   # {zone_id: (prio, diff)}
+        self.weighted_sum = 0.0                     # sum of prio * diff
+        self.weight_sum = 0.0                       # sum of prio
+        self.engine = DemandEngine()
+        self.stats: dict = self.engine.compute(full_scale)
+        self.temp_diff: Optional[float] = 0.0
+        self.demand = False
+
+    def set_zone(self, zone_id: str, target: float, actual: float, prio: float) -> bool:
+        """Replaces the values of a zone, True if its contribution changed."""
+        self.engine.set_zone(zone_id, target, actual, prio)
+        diff = max(0.0, target - actual)
+        old = self.contributions.get(zone_id)
+        if old == (prio, diff):
+            return False
+        if old:
+            self.weighted_sum -= old[0] * old[1]
+            self.weight_sum -= old[0]
+        self.contributions[zone_id] = (prio, diff)
+        self.weighted_sum += prio * diff
+        self.weight_sum += prio
+        return True
+
+    def remove_zone(self, zone_id: str):
+        """Removes a zone from the group."""
+        self.engine.remove_zone(zone_id)
+        old = self.contributions.pop(zone_id, None)
+        if old:
+            self.weighted_sum -= old[0] * old[1]
+            self.weight_sum -= old[0]
+
+    def resync(self):
+        """Exact sums, so rounding errors cannot add up."""
+        self.weighted_sum = math.fsum(prio * diff for prio, diff in self.contributions.values())
+        self.weight_sum = math.fsum(prio for prio, _ in self.contributions.values())
+
+    def get_mean(self) -> float:
+        """Priority-weighted mean temperature difference."""
+        if self.weight_sum <= 0:
+            return 0.0
+        return round(max(0.0, self.weighted_sum) / self.weight_sum, 1)
+
+    def compute_stats(self) -> dict:
+        self.stats = self.engine.compute(self.full_scale)
+        return self.stats
+
+    def update_demand(self, temp: float, hysteresis: float) -> bool:
+        """Hysteresis: on above hysteresis, off at <= 0. True if changed."""
+        if not self.demand and temp > hysteresis:
+            self.demand = True
+            _LOGGER.info("%s Heating ON: Δ=%.2f°C > %.2f°C", self.name, temp, hysteresis)
+            return True
+        if self.demand and temp <= 0:
+            self.demand = False
+            _LOGGER.info("%s Heating OFF: Δ=%.2f°C <= 0°C", self.name, temp)
+            return True
+        return False
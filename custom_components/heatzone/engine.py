@@ -0,0 +1,113 @@
+# /config/custom_components/heatzone/engine.py
+
+from datetime import datetime
+from typing import Callable, Iterable, NamedTuple, Optional
+from .const import *
+
+
+class ZoneInputs(NamedTuple):
+    """Everything the target temperature of a zone depends on."""
+    mode: Optional[str] = None              # HeaterMode, None = manual
+    present: bool = True                    # False: the away temp of the profile
+    manual_temp: Optional[float] = None
+    topic: Optional[str] = None             # profile topic, None = no valid profile
+    override_type: Optional[str] = None     # OverrideType of the active override
+    override_temp: Optional[float] = None
+    boost_temp: Optional[float] = None      # None = no boost
+    window_open: bool = False               # 0°C is due (lockout expired)
+
+
+class ZoneDecision(NamedTuple):
+    target_temp: float
+    source: str         # manual, fallback, profile, away, holiday, override, boost, window
+    scheduled: bool     # follows the schedule of the profile
+
+
+# temp of a profile: fn(topic, mode, now) -> temp
+TempLookup = Callable[[str, str, datetime], float]
+
+
+class TargetEngine:
+    """Decides the target temperature of zones (mode, presence, override, boost, window).
+
+    Plain Python without Home Assistant: all inputs are explicit, profile
+    temperatures come from temp_lookup and the time from clock.
+    """
+
+    def __init__(self, temp_lookup: TempLookup, clock: Callable[[], datetime] = datetime.now):
+        self.temp_lookup = temp_lookup
+        self.clock = clock
+
+    def now(self) -> datetime:
+        return self.clock()
+
+    def evaluate(self, inputs: ZoneInputs, now: Optional[datetime] = None) -> ZoneDecision:
+        """Target temperature of one zone; later decisions win."""
+        now = now or self.clock()
+        mode = inputs.mode
+        topic = inputs.topic
+        temp = TEMP_OFF
+        source = HeaterMode.OFF.value
+
+        if not mode or mode == HeaterMode.MANUAL.value:
+            # In manual mode, the user sets the temperature themselves.
+            if inputs.manual_temp is not None:
+                temp, source = inputs.manual_temp, HeaterMode.MANUAL.value
+            else:
+                temp, source = TEMP_FALLBACK, "fallback"
+
+        scheduled = False
+        if not topic:
+            temp, source = TEMP_FALLBACK, "fallback"
+        else:
+            # change mode to get the temp if not present
+            if not inputs.present:
+                mode = HeaterExtendedMode.AWAY.value
+                temp, source = self.temp_lookup(topic, mode, now), mode
+            if mode in (HeaterMode.PROFIL.value, HeaterMode.HOLIDAY.value):
+                temp, source = self.temp_lookup(topic, mode, now), mode
+            scheduled = mode == HeaterMode.PROFIL.value
+
+        # scheduled override (not if the zone is switched off)
+        if inputs.override_type and inputs.mode != HeaterMode.OFF.value:
+            temp, source = self._override_temp(inputs, now), "override"
+
+        if inputs.boost_temp is not None:
+            temp, source = inputs.boost_temp, HeaterExtendedMode.BOOST.value
+
+        if inputs.window_open:
+            temp, source = TEMP_OFF, "window"
+
+        return ZoneDecision(temp, source, scheduled)
+
+    def evaluate_base(self, inputs: ZoneInputs, now: Optional[datetime] = None) -> ZoneDecision:
+        """Decision of mode, presence and profile only (no override, boost or window).
+
+        If scheduled, the target follows the schedule of the profile over time.
+        """
+        return self.evaluate(inputs._replace(override_type=None, override_temp=None,
+                                             boost_temp=None, window_open=False), now)
+
+    def evaluate_override(self, inputs: ZoneInputs, override_type: str,
+                          override_temp: Optional[float] = None,
+                          now: Optional[datetime] = None) -> Optional[float]:
+        """Target temperature while an override is active, None if it does not apply."""
+        decision = self.evaluate(inputs._replace(override_type=override_type, override_temp=override_temp,
+                                                 boost_temp=None, window_open=False), now)
+        return decision.target_temp if decision.source == "override" else None
+
+    def evaluate_many(self, inputs: Iterable[ZoneInputs],
+                      now: Optional[datetime] = None) -> list:
+        """Decisions for many zones at the same point in time."""
+        now = now or self.clock()
+        return [self.evaluate(zone_inputs, now) for zone_inputs in inputs]
+
+    def _override_temp(self, inputs: ZoneInputs, now: datetime) -> float:
+        """Target temperature while an override is active."""
+        if inputs.override_type == OverrideType.TEMPERATURE:
+            return inputs.override_temp if inputs.override_temp is not None else TEMP_FALLBACK
+        if not inputs.topic:
+            return TEMP_FALLBACK
+        if inputs.override_type == OverrideType.ABSENT:
+            return self.temp_lookup(inputs.topic, HeaterExtendedMode.AWAY.value, now)
+        return self.temp_lookup(inputs.topic, HeaterMode.HOLIDAY.value, now)
@@ -1,12 +1,12 @@
 # /config/custom_components/heatzone/entity.py
 
 from __future__ import annotations
+import time
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers import entity_registry as er
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback, Event
-from homeassistant.const import EVENT_STATE_CHANGED, STATE_ON  
 from homeassistant.components.number import NumberEntity
 from homeassistant.components.select import SelectEntity
 from homeassistant.components.sensor import SensorEntity
@@ -14,10 +14,14 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.text import TextEntity
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.components.button import ButtonEntity
+from homeassistant.components.calendar import CalendarEntity
 from homeassistant.helpers import translation
+from homeassistant.helpers.event import async_track_state_change_event, async_call_later
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from typing import Optional
 from abc import abstractmethod
 
+from .aggregator import SourceAggregator
 from .const import *
 import logging
 
@@ -36,6 +40,7 @@ class ZoneEntityCore(RestoreEntity):
     _attr_use_translation: bool = True  # use translation for names
     _attr_has_entity_name = False       # no automatic prefixing !
     _update_temps = False               # update temps if changed
+    _batch_field: str | None = None     # zone attribute of heatzone.set_zones, needs async_apply_batch
 
     _attr_default_value: str | float | None = None
     _attr_native_value: str | float | None = None
@@ -90,6 +95,8 @@ class ZoneEntityCore(RestoreEntity):
                 return "text"
             if cls is ButtonEntity:
                 return "button"
+            if cls is CalendarEntity:
+                return "calendar"
         return None
 
     async def _translate_name(self, key: str) -> str:
@@ -114,6 +121,9 @@ class ZoneEntityCore(RestoreEntity):
         """restore state, defaults & name-translation."""
         await super().async_added_to_hass()
 
+        if self._batch_field and self._manager:
+            self._manager.register_zone_entity(self._zone_id, self._batch_field, self)
+
         if self._attr_use_translation:
             translated = await self._translate_name(self._attr_unique_suffix)
 
@@ -154,6 +164,11 @@ class ZoneEntityCore(RestoreEntity):
 
         _LOGGER.debug("No restore/default for %s", self.entity_id)
 
+    async def async_will_remove_from_hass(self) -> None:
+        if self._batch_field and self._manager:
+            self._manager.unregister_zone_entity(self._zone_id, self._batch_field, self)
+        await super().async_will_remove_from_hass()
+
     @property
     def native_value(self) -> str | float | None:
         return self._attr_native_value
@@ -191,7 +206,7 @@ class ZoneEntityCore(RestoreEntity):
             return
         
         if getattr(self, "_update_temps", False):
-            self.hass.async_create_task(self._manager.update_temps())
+            self._manager.request_update(self._zone_id, UPDATE_DEBOUNCE_SECONDS)
 
 
 # ---------------------------------------------------------------------------
@@ -202,20 +217,46 @@ class ZoneMirrorEntityBase(ZoneEntityCore):
     """Common base class for all mirror entities (Sensor + BinarySensor)."""
 
     _attr_select_suffix: str = ""
+    _attr_aggregate: str = "mean"                   # reducer for multiple sources, without setting
+    _attr_reducer_setting: Optional[str] = None     # global setting with the reducer
 
     @abstractmethod
-    def _get_mirrored_value(self, target_state):
-        """Extracts the value from the mirrored sensor."""
+    def _get_mirrored_value(self, value: float):
+        """Converts the aggregated value of the selected sources."""
         pass
 
+    @staticmethod
+    def _parse_source_state(state: str) -> Optional[float]:
+        """Numeric value of a source state."""
+        return float(state)
+
+    def _get_source_max_age(self) -> Optional[float]:
+        """Seconds after which a source without update is ignored, None = never."""
+        return None
+
+    def _get_reducer(self) -> str:
+        """Reducer from the global setting, _attr_aggregate without one."""
+        manager = self._manager
+        if manager and self._attr_reducer_setting:
+            return getattr(manager.settings, self._attr_reducer_setting)
+        return self._attr_aggregate
+
     async def async_added_to_hass(self) -> None:
         """Register listeners and initialize selection."""
         await super().async_added_to_hass()
         
         # Initialize mirror-specific attributes
         self._selected_entity_id: str | None = None
+        self._selected_entity_ids: list = []
+        self._aggregator = SourceAggregator(self._get_reducer(), self._parse_source_state,
+                                            self._get_source_max_age())
         self._unsub_select = None
         self._unsub_sensor = None
+        self._unsub_stale = None
+        self._stale_at: Optional[float] = None
+        self._unsub_settings = async_dispatcher_connect(
+            self.hass, f"{DOMAIN}_global_settings_update", self._handle_settings_change
+        )
         self._select_entity_id = f"select.{self._zone_id}_{self._attr_select_suffix}"
 
         _LOGGER.debug("[%s] Watching select entity: %s", self._zone_id, self._select_entity_id)
@@ -224,80 +265,65 @@ class ZoneMirrorEntityBase(ZoneEntityCore):
         # select change listener
         @callback
         def _handle_select_change(event: Event):
-            if event.data.get("entity_id") != self._select_entity_id:
-                return
             _LOGGER.debug("[%s] Select changed → refreshing", self._zone_id)
             self.hass.async_create_task(self._update_selected_sensor_id())
 
-        self._unsub_select = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _handle_select_change
+        self._unsub_select = async_track_state_change_event(
+            self.hass, [self._select_entity_id], _handle_select_change
         )
 
-        # sensor change listener - jetzt für alle ausgewählten Entities
-        @callback
-        def _handle_sensor_change(event: Event):
-            # Prüfe, ob das geänderte Entity Teil der ausgewählten Entities ist
-            changed_entity_id = event.data.get("entity_id")
-            
-            # Überwache alle ausgewählten Entities
-            if hasattr(self, '_selected_entity_ids') and self._selected_entity_ids:
-                if changed_entity_id in self._selected_entity_ids:
-                    force_refresh = self._detect_platform() == "sensor"
-                    self.async_schedule_update_ha_state(force_refresh=force_refresh)
-                    return
-            
-            # Auch für den Fall, dass es sich um ein einzelnes Entity handelt
-            if hasattr(self, '_selected_entity_id') and self._selected_entity_id:
-                if changed_entity_id == self._selected_entity_id:
-                    force_refresh = self._detect_platform() == "sensor"
-                    self.async_schedule_update_ha_state(force_refresh=force_refresh)
-
-        self._unsub_sensor = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _handle_sensor_change
-        )
+    @callback
+    def _handle_sensor_change(self, event: Event):
+        """State change of one selected source: only its value is updated."""
+        if self._aggregator.update(event.data["entity_id"], event.data.get("new_state")):
+            self._on_sources_changed()
+
+    @callback
+    def _handle_settings_change(self, field: str):
+        """A global setting changed, the max age and the reducer concern the sources."""
+        if field == "source_max_age":
+            self._aggregator.set_max_age(self._get_source_max_age())
+        elif field == self._attr_reducer_setting:
+            self._aggregator.set_reducer(self._get_reducer())
+        else:
+            return
+        self._on_sources_changed()
 
     async def _update_selected_sensor_id(self):
         """Reads the currently selected sensor from select and sets up listeners."""
         
         select_state = self.hass.states.get(self._select_entity_id)
-        if not select_state:
-            self._selected_entity_id = None
-            self._selected_entity_ids = []
-            self.async_schedule_update_ha_state()
-            return
-
-        selected_friendly = select_state.state
-        if selected_friendly in (None, "unknown", "None"):
-            self._selected_entity_id = None
-            self._selected_entity_ids = []
-            self.async_schedule_update_ha_state()
-            return
-
-        entity_map = select_state.attributes.get("entity_map")
-        if not entity_map:
+        selected_friendly = select_state.state if select_state else None
+        entity_map = select_state.attributes.get("entity_map") if select_state else None
+        
+        if selected_friendly in (None, "unknown", "None") or not entity_map:
             self._selected_entity_id = None
             self._selected_entity_ids = []
-            self.async_schedule_update_ha_state()
-            return
-
         # Prüfe ob Multi-Select aktiv ist
-        allow_multiple = select_state.attributes.get("allow_multiple", False)
-        
-        if not allow_multiple:
+        elif not select_state.attributes.get("allow_multiple", False):
             # Einzelne Auswahl
             self._selected_entity_id = entity_map.get(selected_friendly)
             self._selected_entity_ids = [self._selected_entity_id] if self._selected_entity_id else []
         else:
             # Mehrfachauswahl
-            selected_entity_ids = select_state.attributes.get("selected_entity_ids", [])
             self._selected_entity_id = None  # Für Multi-Select kein einzelner ID
-            self._selected_entity_ids = selected_entity_ids
+            self._selected_entity_ids = list(select_state.attributes.get("selected_entity_ids", []))
             
         _LOGGER.debug("[%s] Selected sensors: %s", self._zone_id, self._selected_entity_ids)
         
-        # force_refresh nur für normale Sensoren
-        force_refresh = self._detect_platform() == "sensor"
-        self.async_schedule_update_ha_state(force_refresh=force_refresh)
+        # current values of the sources, then only their own state changes
+        self._aggregator.set_sources({
+            entity_id: self.hass.states.get(entity_id) for entity_id in self._selected_entity_ids
+        })
+        if self._unsub_sensor:
+            self._unsub_sensor()
+            self._unsub_sensor = None
+        if self._selected_entity_ids:
+            self._unsub_sensor = async_track_state_change_event(
+                self.hass, self._selected_entity_ids, self._handle_sensor_change
+            )
+        
+        self._on_sources_changed()
     
     async def async_will_remove_from_hass(self):
         """remove all listener"""
@@ -308,80 +334,39 @@ class ZoneMirrorEntityBase(ZoneEntityCore):
         if self._unsub_sensor:
             self._unsub_sensor()
             self._unsub_sensor = None
+        if self._unsub_stale:
+            self._unsub_stale()
+            self._unsub_stale = None
+        if self._unsub_settings:
+            self._unsub_settings()
+            self._unsub_settings = None
+        await super().async_will_remove_from_hass()
 
-    def _get_target_state(self):
-        """Get the state of the sensor(s) - supports both single and multiple selection."""
-        
-        if not self._selected_entity_id and not getattr(self, '_selected_entity_ids', []):
-            return None
+    @callback
+    def _on_sources_changed(self):
+        """The aggregated value may have changed: new stale timer, new state."""
+        self._schedule_stale()
+        self.async_write_ha_state()
+
+    def _get_aggregated_value(self) -> Optional[float]:
+        """Aggregated value of the selected source(s), None if none is valid."""
+        return self._aggregator.value(time.time())
+
+    def _schedule_stale(self):
+        """Writes the state again when the next source goes stale."""
+        now = time.time()
+        self._aggregator.value(now)
+        stale_at = self._aggregator.valid_until
+        if stale_at != self._stale_at:
+            if self._unsub_stale:
+                self._unsub_stale()
+                self._unsub_stale = None
+            self._stale_at = stale_at
+            if stale_at is not None:
+                self._unsub_stale = async_call_later(self.hass, max(0.0, stale_at - now), self._on_source_stale)
 
-        # Hole den Select-State um zu prüfen ob Multi-Select aktiv ist
-        select_state = self.hass.states.get(self._select_entity_id)
-        if not select_state:
-            return None
-        
-        # Prüfe ob Multi-Select aktiv ist
-        allow_multiple = select_state.attributes.get("allow_multiple", False)
-        
-        if not allow_multiple:
-            # Single-Select: Wie bisher, nur ein Entity
-            target_state = self.hass.states.get(self._selected_entity_id)
-            if not target_state or target_state.state in ("unknown", "unavailable"):
-                return None
-            return target_state
-        
-        else:
-            # Multi-Select: Behandle alle ausgewählten Entities
-            selected_entity_ids = getattr(self, '_selected_entity_ids', [])
-            
-            if not selected_entity_ids:
-                return None
-            
-            # Unterscheide zwischen BinarySensor und normalem Sensor
-            is_binary = self._detect_platform() == "binary_sensor"
-            
-            if is_binary:
-                # BinarySensor (Window): Wenn EINER offen ist → offen
-                for entity_id in selected_entity_ids:
-                    state = self.hass.states.get(entity_id)
-                    if state and state.state not in ("unknown", "unavailable"):
-                        if state.state in (STATE_ON, "open"):
-                            # Mindestens einer ist offen → return diesen State
-                            return state
-                
-                # Alle geschlossen → return letzten State als "closed"
-                last_state = self.hass.states.get(selected_entity_ids[-1])
-                return last_state if last_state else None
-            
-            else:
-                # Sensor (Temperature/Humidity): Durchschnitt berechnen
-                valid_values = []
-                last_valid_state = None
-                
-                for entity_id in selected_entity_ids:
-                    state = self.hass.states.get(entity_id)
-                    if state and state.state not in ("unknown", "unavailable"):
-                        try:
-                            value = float(state.state)
-                            valid_values.append(value)
-                            last_valid_state = state
-                        except (ValueError, TypeError):
-                            continue
-                
-                if not valid_values or not last_valid_state:
-                    return None
-                
-                # Berechne Durchschnitt
-                average = sum(valid_values) / len(valid_values)
-                
-                # Erstelle einen "virtuellen" State-Objekt mit Durchschnittswert
-                # Kopiere Attribute vom letzten validen State
-                from types import SimpleNamespace
-                
-                virtual_state = SimpleNamespace(
-                    state=str(round(average, 1)),
-                    attributes=last_valid_state.attributes.copy(),
-                    entity_id=self._select_entity_id  # Referenz zum Select
-                )
-                
-                return virtual_state
\ No newline at end of file
+    @callback
+    def _on_source_stale(self, _now):
+        self._unsub_stale = None
+        self._stale_at = None
+        self._on_sources_changed()
@@ -0,0 +1,78 @@
+# /config/custom_components/heatzone/estimator.py
+
+import asyncio
+import numpy as np
+from homeassistant.core import HomeAssistant
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+SLOT_MINUTES = 15
+SLOTS_PER_HOUR = 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * 24 * SLOTS_PER_HOUR
+DAY_MINUTES = 1440
+
+
+def build_week(days: list, temps: dict, default: float) -> np.ndarray:
+    """Setpoint per 15 min slot of the week from the compiled day schedules.
+
+    days:    [bytearray(1440) of TempIDs or None], Monday first
+    temps:   {TempID: setpoint}, other TempIDs get default
+    """
+    table = np.full(256, default, dtype=np.float64)
+    for temp_id, temp in temps.items():
+        table[temp_id] = temp
+
+    temp_ids = np.full((7, DAY_MINUTES), 255, dtype=np.uint8)
+    for day, minutes in enumerate(days):
+        if minutes is not None:
+            temp_ids[day] = np.frombuffer(minutes, dtype=np.uint8)
+    return table[temp_ids[:, ::SLOT_MINUTES].ravel()]
+
+
+def estimate_candidate(name: str, week: np.ndarray, first_slot: int, slots: int, zones: list) -> dict:
+    """Setpoint-hours of one schedule over a period in 15 min slots.
+
+    Runs in an executor thread, NumPy releases the GIL for the array work.
+    week:       setpoint per 15 min slot of the week (Monday 0:00 first)
+    first_slot: slot of the week at the start of the period
+    zones:      [(zone_id, priority, [(start_slot, end_slot, setpoint)])]
+    """
+    # bypass (-1°C) and off do not heat
+    week_setpoints = np.maximum(week, 0.0)
+    setpoints = week_setpoints[(np.arange(slots) + first_slot) % WEEK_SLOTS]
+
+    result = {
+        "name": name,
+        "setpoint_hours": round(float(setpoints.sum()) / SLOTS_PER_HOUR, 1),
+        "heating_hours": round(float(np.count_nonzero(setpoints)) / SLOTS_PER_HOUR, 1),
+        "zones": {},
+        "priorities": {},
+    }
+
+    for zone_id, priority, periods in zones:
+        zone_setpoints = setpoints
+        if periods:
+            zone_setpoints = setpoints.copy()
+            for start, end, setpoint in periods:
+                zone_setpoints[start:end] = max(setpoint, 0.0)
+
+        setpoint_hours = float(zone_setpoints.sum()) / SLOTS_PER_HOUR
+        result["zones"][zone_id] = {
+            "priority": priority,
+            "setpoint_hours": round(setpoint_hours, 1),
+            "heating_hours": round(float(np.count_nonzero(zone_setpoints)) / SLOTS_PER_HOUR, 1),
+            "weighted_setpoint_hours": round(priority * setpoint_hours, 1),
+        }
+        key = str(priority)
+        result["priorities"][key] = round(result["priorities"].get(key, 0.0) + setpoint_hours, 1)
+
+    return result
+
+
+async def async_estimate(hass: HomeAssistant, jobs: list) -> list:
+    """Run estimate_candidate for all jobs without blocking the event loop."""
+    _LOGGER.debug(f"Estimating {len(jobs)} schedules")
+    return list(await asyncio.gather(*(
+        hass.async_add_executor_job(estimate_candidate, *job) for job in jobs
+    )))
@@ -1,13 +1,23 @@
 # /config/custom_components/heatzone/mqtt_profile_manager.py
 
+import re
 import json
 import asyncio
+import contextlib
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import Optional, Dict
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
-import paho.mqtt.client as mqtt_client
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time, async_track_state_change_event
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+from .scheduler import DeadlineScheduler
+from .mqtt_transport import MqttTransport
+from .overrides import OverrideStore
+from .estimator import async_estimate, build_week, SLOT_MINUTES, SLOTS_PER_HOUR
+from .runtime import ZoneRuntime, GlobalSettings, ZONE_ENTITY_FIELDS
+from .demand import DemandGroup
+from .engine import TargetEngine, ZoneInputs
 from .const import *
 
 import logging
@@ -18,17 +28,240 @@ class ProfileData:
     
     def __init__(self, topic: str):
         self.topic = topic
-        self.data = {}
+        self.own = {}                               # payloads of this topic
+        self.data = {}                              # flattened with base profiles
+        self.temps: Dict[str, float] = {}            # {"Temp1": 21.0, ...}
+        self.days: list = [None] * 7                # [bytearray(1440) of TempIDs]
+        self._day_changes: list = [[] for _ in range(7)]  # [minutes of the day with new TempID]
+        self._changes: Optional[list] = []          # [minute of week with new TempID], None = rebuild
+        self._segments: Optional[list] = None       # [(start, end, TempID)] cache
+        self._segment_ends: list = []
+        self.revision = 0                           # counts changed payloads
         self.last_update = None
         self.last_access = datetime.now()
-    
+
     def update_subtopic(self, subtopic: str, value: str):
-        """Updates a sub-topic value."""
+        """Updates a sub-topic value and compiles it."""
+        changed = self.data.get(subtopic) != value
         self.data[subtopic] = value
+
+        # unchanged payloads (e.g. retained on reconnect) keep their compiled form
+        if changed:
+            self.revision += 1
+            handler = FIELD_HANDLERS.get(subtopic)
+            if handler:
+                handler(self, subtopic, value)
+
         self.last_update = datetime.now()
-        self.last_access = datetime.now()
         _LOGGER.debug(f"Topic {self.topic}: {subtopic} = {value}")
-    
+
+    def remove_subtopic(self, subtopic: str):
+        """Removes a sub-topic value, e.g. when it is no longer inherited."""
+        if subtopic not in self.data:
+            return
+        del self.data[subtopic]
+        self.revision += 1
+        handler = FIELD_HANDLERS.get(subtopic)
+        if handler:
+            handler(self, subtopic, None)
+
+    def apply(self, flattened: dict) -> bool:
+        """Applies flattened data, compiles changed sub-topics only."""
+        revision = self.revision
+        for subtopic in [key for key in self.data if key not in flattened]:
+            self.remove_subtopic(subtopic)
+        for subtopic, value in flattened.items():
+            self.update_subtopic(subtopic, value)
+        return self.revision != revision
+
+    def get_base_topic(self) -> Optional[str]:
+        """Topic of the base profile, if one is declared."""
+        base = self.own.get(BASE_SUBTOPIC, "").strip()
+        if not base:
+            return None
+        return PREFIX_TOPIC + base.lower()
+
+    def _set_temp(self, subtopic: str, value: Optional[str]):
+        """Field handler of Temp1 ... TempHoliday, None removes the value."""
+        if value is None:
+            self.temps.pop(subtopic, None)
+        else:
+            self.temps[subtopic] = self._parse_temp(subtopic, value)
+
+    def _set_day(self, subtopic: str, value: Optional[str]):
+        """Field handler of Day1 ... Day7, None removes the schedule."""
+        index = DAY_INDEX[subtopic]
+        slots = None if value is None else self._compile_day(subtopic, value)
+        self.days[index] = slots
+        # runs of equal TempIDs, found by the regex engine instead of a loop per minute
+        self._day_changes[index] = [run.start() for run in _RUNS.finditer(slots)][1:] if slots else []
+        # the week is rebuilt once on the next read, not per Day payload of a batch
+        self._changes = None
+        self._segments = None
+
+    def _set_raw(self, subtopic: str, value: Optional[str]):
+        """Field handler of sub-topics that are used as payload only (Activated, Base)."""
+
+    def _parse_temp(self, subtopic: str, value: str) -> float:
+        """Converts a temperature payload to float."""
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            _LOGGER.error(f"Topic {self.topic}: Cannot convert {subtopic} value '{value}' to float")
+            return TEMP_FALLBACK
+
+    def _compile_day(self, subtopic: str, value: str) -> Optional[bytearray]:
+        """Compiles a day schedule into a TempID per minute of the day."""
+        try:
+            periods = json.loads(value)
+        except (json.JSONDecodeError, TypeError) as e:
+            _LOGGER.error(f"Topic {self.topic}: Error parsing {subtopic}: {e}")
+            return None
+
+        if not isinstance(periods, list):
+            _LOGGER.error(f"Topic {self.topic}: {subtopic} is not a list of periods")
+            return None
+
+        slots = bytearray([TEMP_ID_NONE]) * SLOTS_PER_DAY
+
+        # reversed, so the first matching period wins
+        for period in reversed(periods):
+            if not isinstance(period, dict):
+                _LOGGER.warning(f"Topic {self.topic}: {subtopic} invalid period {period}")
+                continue
+
+            start = _parse_minutes(period.get("From", "0:00"))
+            end = _parse_minutes(period.get("To", "24:00"))
+            if start is None or end is None:
+                _LOGGER.warning(f"Topic {self.topic}: {subtopic} invalid time in period {period}")
+                continue
+
+            temp_id = period.get("TempID", 0)
+            if isinstance(temp_id, float) and temp_id.is_integer():
+                temp_id = int(temp_id)
+            if not isinstance(temp_id, int) or not 0 <= temp_id <= TEMP_ID_OFF:
+                _LOGGER.warning(f"Topic {self.topic}: {subtopic} unknown TempID {temp_id}, using fallback")
+                temp_id = 0
+
+            if end < start:
+                # over midnight
+                slots[start:] = bytes([temp_id]) * (SLOTS_PER_DAY - start)
+                slots[:end] = bytes([temp_id]) * end
+            elif start < end:
+                slots[start:end] = bytes([temp_id]) * (end - start)
+
+        return slots
+
+    @property
+    def changes(self) -> list:
+        """Minutes of the week at which the TempID changes."""
+        if self._changes is None:
+            self._changes = self._build_changes()
+        return self._changes
+
+    def _build_changes(self) -> list:
+        """Joins the changes of the days, checks the TempID at each day boundary."""
+        changes = []
+        previous = self.days[-1][-1] if self.days[-1] else TEMP_ID_NONE
+        for day, slots in enumerate(self.days):
+            offset = day * SLOTS_PER_DAY
+            first = slots[0] if slots else TEMP_ID_NONE
+            if first != previous:
+                changes.append(offset)
+            changes.extend(offset + minute for minute in self._day_changes[day])
+            previous = slots[-1] if slots else TEMP_ID_NONE
+        return changes
+
+    def get_segments(self) -> list:
+        """Periods of the week with one TempID as [(start, end, TempID)] in minutes.
+
+        Starts are sorted; the last period may end after the end of the week.
+        """
+        if self._segments is not None:
+            return self._segments
+
+        changes = self.changes
+        if changes:
+            bounds = changes + [changes[0] + SLOTS_PER_WEEK]
+            segments = [
+                (start, end, self.get_temp_id_at_minute(start))
+                for start, end in zip(bounds, bounds[1:])
+            ]
+        else:
+            segments = [(0, SLOTS_PER_WEEK, self.get_temp_id_at_minute(0))]
+
+        self._segments = [seg for seg in segments if seg[2] != TEMP_ID_NONE]
+        self._segment_ends = [seg[1] for seg in self._segments]
+        return self._segments
+
+    def get_periods(self, start: datetime, end: datetime) -> list:
+        """Scheduled periods overlapping [start, end) as [(start, end, TempID)]."""
+        segments = self.get_segments()
+        if not segments:
+            return []
+
+        monday = (start - timedelta(days=start.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+        periods = []
+
+        # the last period of the previous week may reach into this week
+        last_start, last_end, last_id = segments[-1]
+        previous = monday - timedelta(weeks=1)
+        if previous + timedelta(minutes=last_end) > start:
+            periods.append((previous + timedelta(minutes=last_start),
+                            previous + timedelta(minutes=last_end), last_id))
+
+        # skip the periods of this week that ended before start
+        minute = int((start - monday).total_seconds() // 60)
+        index = bisect_right(self._segment_ends, minute)
+        week = 0
+        while True:
+            base = monday + timedelta(weeks=week)
+            for seg_start, seg_end, temp_id in segments[index:]:
+                period_start = base + timedelta(minutes=seg_start)
+                if period_start >= end:
+                    return periods
+                periods.append((period_start, base + timedelta(minutes=seg_end), temp_id))
+            index = 0
+            week += 1
+
+    def next_change(self, when: datetime) -> Optional[datetime]:
+        """Get the next point in time at which the schedule changes."""
+        if not self.changes:
+            return None
+        minute = when.weekday() * SLOTS_PER_DAY + when.hour * 60 + when.minute
+        index = bisect_right(self.changes, minute)
+        if index < len(self.changes):
+            delta = self.changes[index] - minute
+        else:
+            delta = self.changes[0] + SLOTS_PER_WEEK - minute
+        return when.replace(second=0, microsecond=0) + timedelta(minutes=delta)
+
+    def get_temp_by_id(self, temp_id: int) -> float:
+        """Maps a TempID to the actual temperature."""
+        if 1 <= temp_id <= 4:
+            return self.temps.get(f"Temp{temp_id}", TEMP_FALLBACK)
+
+        if temp_id == TEMP_ID_OFF:
+            return TEMP_OFF
+
+        return TEMP_FALLBACK
+
+    def get_temp_at(self, when: datetime) -> float:
+        """Looks up the scheduled temperature for a point in time."""
+        return self.get_temp_at_minute(when.weekday() * SLOTS_PER_DAY + when.hour * 60 + when.minute)
+
+    def get_temp_at_minute(self, minute: int) -> float:
+        """Looks up the scheduled temperature for a minute of the week."""
+        return self.get_temp_by_id(self.get_temp_id_at_minute(minute))
+
+    def get_temp_id_at_minute(self, minute: int) -> int:
+        """Looks up the scheduled TempID for a minute of the week."""
+        slots = self.days[minute // SLOTS_PER_DAY]
+        if slots is None:
+            return TEMP_ID_NONE
+        return slots[minute % SLOTS_PER_DAY]
+
     def mark_accessed(self):
         """Marks the profile as recently used."""
         self.last_access = datetime.now()
@@ -46,6 +279,68 @@ class ProfileData:
         return delta.total_seconds() > (timeout_minutes * 60)
 
 
+_RUNS = re.compile(rb"(.)\1*", re.S)
+
+DAY_INDEX = {subtopic: index for index, subtopic in enumerate(DAY_SUBTOPICS)}
+
+# {subtopic: fn(profile, subtopic, value)}, the accepted sub-topics of a profile
+FIELD_HANDLERS = {
+    subtopic: ProfileData._set_temp if subtopic in TEMP_SUBTOPICS
+    else ProfileData._set_day if subtopic in DAY_INDEX
+    else ProfileData._set_raw
+    for subtopic in PROFILE_SUBTOPICS
+}
+
+
+def _get_profile_temp(profile: ProfileData, mode: str, now: datetime) -> float:
+    """Temperature of a complete profile in a mode."""
+    if mode == HeaterExtendedMode.AWAY.value:
+        return profile.temps.get("TempAway", TEMP_FALLBACK)
+    if mode == HeaterMode.HOLIDAY.value:
+        return profile.temps.get("TempHoliday", TEMP_FALLBACK)
+    if mode == HeaterMode.PROFIL.value:
+        return profile.get_temp_at(now)
+    if mode != HeaterExtendedMode.BYPASS.value:
+        _LOGGER.warning(f"Topic {profile.topic}: Unknown mode {mode}")
+    return TEMP_FALLBACK
+
+
+def _profile_temp_lookup(profile: Optional[ProfileData]):
+    """Engine temp lookup of one compiled profile, TEMP_FALLBACK without one."""
+    def lookup(topic: str, mode: str, now: datetime) -> float:
+        if profile is None:
+            return TEMP_FALLBACK
+        return _get_profile_temp(profile, mode, now)
+    return lookup
+
+
+def _overlay(points: list, start: int, end: int, temp: float) -> list:
+    """Replaces the value of change points [(minute, temp)] in [start, end)."""
+    if start >= end:
+        return points
+    
+    before = [p for p in points if p[0] < start]
+    after = [p for p in points if p[0] > end]
+    
+    # value that is active again at the end
+    restore = points[0][1]
+    for minute, value in points:
+        if minute > end:
+            break
+        restore = value
+    
+    return before + [(start, temp), (end, restore)] + after
+
+
+def _parse_minutes(value) -> Optional[int]:
+    """Converts "H:MM" to minutes of the day (24:00 = 1440)."""
+    try:
+        hours, minutes = map(int, value.split(":"))
+    except (ValueError, AttributeError):
+        return None
+    return max(0, min(SLOTS_PER_DAY, hours * 60 + minutes))
+
+
 class ProfileManager:
     """Manages MQTT profiles on a topic-based basis and calc temps"""
     
@@ -54,97 +349,128 @@ class ProfileManager:
         self.config_entry = config_entry
         self.profiles: Dict[str, ProfileData] = {}  # {topic: ProfileData}
         self.subscribed_topics: Dict[str, list] = {} 
-         # {topic: [full_topics]}
-        self.zone_last_temps: Dict[str, float] = {} 
-        # {zone_id: {"active": bool, "until": datetime, "temp": float}}
-        self.zone_boost_data: Dict[str, dict] = {} 
-        self.zone_boost_tasks: Dict[str, asyncio.Task] = {}
-        self.zone_window_open: Dict[str, bool] = {}
-        self.zone_window_timers: Dict[str, any] = {}
-        self.zone_current_temp: Dict[str, float] = {}     
-        self.zone_entity_values: Dict[str, dict]
-        self.global_temp_diff = None
-    
-        self._mqtt_client = None
-        self._mqtt_connected = False
-        self.retrys = 0
-        self.global_temp_diff: Optional[float] = 0.0
-        self.global_heating_demand = False
+         # {topic: [full_topics]}, {None: [PROFILES_WILDCARD]} with subscribe all
+        self._subscribe_all = config_entry.data.get("mqtt_subscribe_all", False)
+        self._inbox: Dict[str, bytes] = {}          # {full_topic: latest payload} until the drain
+        self._inbox_handle: Optional[asyncio.Handle] = None
+        self._unclaimed: Dict[str, dict] = {}       # {topic: {subtopic: payload}} without profile, subscribe all
+        self.mqtt_messages = 0
+        self.mqtt_drains = 0
+        self.zones: Dict[str, ZoneRuntime] = {}     # {zone_id: ZoneRuntime}
+        self.settings = GlobalSettings()
+        self._entity_fields: Dict[str, tuple] = {}  # {entity_id: (zone_id or None, field)}
+        self._state_unsub = None
+    
+        self._mqtt: Optional[MqttTransport] = None
         
         self._startup_complete = False
         self._update_lock = asyncio.Lock()
         
+        # next schedule changes, boost and window delay ends
+        # {("profile", topic) | ("boost", zone_id) | ("window", zone_id): datetime}
+        self._scheduler = DeadlineScheduler()
+        self._scheduler_unsub = None
+        self._scheduler_armed: Optional[datetime] = None
+        self._scheduled_topics: set = set()
+        
+        # {kind: (on_fired(key, data), on_restore(key, when, data) or None)}
+        # deadlines with on_restore are stored and survive a restart
+        self._deadline_handlers: Dict[str, tuple] = {
+            "boost": (self._on_boost_deadline, self._restore_boost),
+            "window": (self._on_window_deadline, self._restore_window),
+            "override": (self._on_override_deadline, None),
+            "profile": (self._on_profile_deadline, None),
+            "cleanup": (self._on_cleanup_deadline, None),
+        }
+        self._deadline_store = Store(hass, DEADLINES_STORAGE_VERSION, DEADLINES_STORAGE_KEY)
+        
+        # scheduled absences, holidays and fixed temperatures
+        self.overrides = OverrideStore(hass)
+        
+        # target temperature decision, profile temps through the cache
+        self.engine = TargetEngine(self._get_cached_temp)
+        
+        # per-cycle temp cache {(topic, mode, minute of week): temp}
+        self._temp_cache: Dict[tuple, float] = {}
+        self.temp_cache_hits = 0
+        self.temp_cache_misses = 0
+        
+        # incremental recalculation: only dirty zones, cached contributions
+        self._dirty_zones: set = set()
+        self._all_zones_dirty = False
+        
+        # demand of all zones and of each heating circuit
+        self.global_group = DemandGroup(GLOBAL_DEVICE_ID, GLOBAL_DEVICE_NAME,
+                                        full_scale=DEMAND_FULL_SCALE)
+        self.circuits: Dict[str, DemandGroup] = {
+            circuit_id: DemandGroup(circuit_id, circuit.get("name", circuit_id),
+                                    circuit.get("hysteresis", DEFAULT_HYSTERESIS), DEMAND_FULL_SCALE)
+            for circuit_id, circuit in config_entry.options.get("circuits", {}).items()
+        }
+        self._zone_topics: Dict[str, Optional[str]] = {}          # {zone_id: topic}
+        self._topic_zones: Dict[str, set] = {}                    # {topic: {zone_ids}}
+        self._zone_schedule_topics: Dict[str, Optional[str]] = {} # {zone_id: topic in profile mode}
+        self.zone_updates = 0
+        
+        # single-flight update: requests collapse into one pending run
+        self._update_task: Optional[asyncio.Task] = None
+        self.update_triggers = 0
+        self.update_runs = 0
+        self._batch_depth = 0
+        
+        # entities that apply set_zones {(zone_id, field): entity}
+        self._zone_entities: Dict[tuple, object] = {}
+        
+        # projected target temps {zone_id: (inputs, [(timestamp, temp)])}
+        self._timeline_cache: Dict[str, tuple] = {}
+        self._timeline_day: Optional[datetime] = None
+        
 # -----------------------------------------------------------------------------
 # ANCHOR - Window Logic
 # -----------------------------------------------------------------------------
  
     def is_window_delay_active(self, zone_id: str) -> bool:
         """Checks if window timer is still running (lockout time active)."""
-        return zone_id in self.zone_window_timers
+        zone = self.zones.get(zone_id)
+        return zone.window.state == WindowState.OPEN if zone else False
 
     def is_window_open(self, zone_id: str) -> bool:
-        """Checks if the window for the zone is open."""
-        return self.zone_window_open.get(zone_id, False)
+        """Checks if the window for the zone is open (0°C sent)."""
+        zone = self.zones.get(zone_id)
+        return zone.window.applied if zone else False
 
     def on_window_opened(self, zone_id: str):
         """Called by the binary sensor when a window is opened."""
-        was_open = self.zone_window_open.get(zone_id, False)
-        
-        if not was_open:
-            # get delay from entity
-            delay_state = self._get_entity_state(zone_id, "window_delay")
-            try:
-                delay = int(float(delay_state)) if delay_state else 10
-            except (ValueError, TypeError):
-                delay = 10
-            
-            _LOGGER.info(f"Zone {zone_id}: Window opened, starting {delay}s delay")
-            
-            # cancel old timer
-            if zone_id in self.zone_window_timers:
-                self.zone_window_timers[zone_id]()
-                self.zone_window_timers.pop(zone_id)
-            
-            self.zone_window_open[zone_id] = True
-            
-            delay = delay * 60   # delay is in minutes
-            
-            # timer start
-            from homeassistant.helpers.event import async_call_later
-            self.zone_window_timers[zone_id] = async_call_later(
-                self.hass,
-                delay,
-                self._apply_window_open_callback(zone_id)
-            )
+        self._report_window(zone_id, True)
 
     def on_window_closed(self, zone_id: str):
         """Called by the binary sensor when the window is closed."""
-        was_open = self.zone_window_open.get(zone_id, False)
-        
-        if was_open:
-            _LOGGER.info(f"Zone {zone_id}: Window closed, restoring temperature immediately")
-            
-            # cancel timer
-            if zone_id in self.zone_window_timers:
-                self.zone_window_timers[zone_id]()
-                self.zone_window_timers.pop(zone_id)
-            
-            self.zone_window_open[zone_id] = False
-            
-            # Immediate update
-            self.hass.async_create_task(self.update_temps())
-
-    def _apply_window_open_callback(self, zone_id: str):
-        """Create callback for timer."""
-        async def callback(now):
-            await self._apply_window_open(zone_id, now)
-        return callback
-
-    async def _apply_window_open(self, zone_id: str, now=None):
-        """After Delay: The window is indeed open."""
-        _LOGGER.info(f"Zone {zone_id}: Window delay expired")
-        self.zone_window_timers.pop(zone_id, None)
-        await self.update_temps()
+        self._report_window(zone_id, False)
+
+    def _report_window(self, zone_id: str, is_open: bool):
+        """Feed the raw contact state into the window state machine of the zone."""
+        zone = self._zone(zone_id)
+        window = zone.window
+        old_state = window.state
+        changed = window.report(is_open, datetime.now(), zone.window_delay, self.settings)
+        if window.state != old_state:
+            _LOGGER.info(f"Zone {zone_id}: Window {old_state} -> {window.state}")
+        self._sync_window(zone_id, changed)
+
+    def _sync_window(self, zone_id: str, changed: bool):
+        """Sets the deadline of the state machine, recalculates on a changed output."""
+        window = self.zones[zone_id].window
+        if window.deadline:
+            self.set_deadline("window", zone_id, window.deadline, {"state": window.state})
+        else:
+            self.cancel_deadline("window", zone_id)
+        if changed:
+            self.request_update(zone_id)
+
+    def get_window_suppressed(self) -> Dict[str, int]:
+        """Suppressed window transitions and deferred re-sends per zone."""
+        return {zone_id: zone.window.suppressed
+                for zone_id, zone in self.zones.items() if zone.window.suppressed}
         
 # -----------------------------------------------------------------------------
 # ANCHOR - Boost logic
@@ -152,98 +478,220 @@ class ProfileManager:
  
     def start_boost(self, zone_id: str):
         """Starts boost for one zone."""
-        duration = int(self._get_global_boost_duration())
+        duration = self.settings.boost_duration
         boost_until = datetime.now() + timedelta(minutes=duration)
-        boost_temp = self._get_global_boost_temp()
-        
-        # cancel old task if exists
-        if zone_id in self.zone_boost_tasks:
-            old_task = self.zone_boost_tasks[zone_id]
-            if not old_task.done():
-                old_task.cancel()
-            _LOGGER.debug(f"Zone {zone_id}: Cancelled previous boost task")
-        
-        self.zone_boost_data[zone_id] = {
-            "active": True,
-            "until": boost_until,
-            "temp": boost_temp
-        }
+        boost_temp = self.settings.boost_temp
         
-        _LOGGER.info(f"Zone {zone_id}: Boost started at {boost_temp}°C for {duration} min")
+        zone = self._zone(zone_id)
+        zone.boost_active = True
+        zone.boost_until = boost_until
+        zone.boost_temp = boost_temp
         
-        # update temps immediately
-        self.hass.async_create_task(self.update_temps())
+        _LOGGER.info(f"Zone {zone_id}: Boost started at {boost_temp}°C for {duration} min")
         
-        # store task-reference
-        async def _disable_later():
-            try:
-                await asyncio.sleep(duration * 60)
-                self.stop_boost(zone_id)
-            except asyncio.CancelledError:
-                _LOGGER.debug(f"Zone {zone_id}: Boost timer cancelled")
+        # boost ends at boost_until (replaces an old one)
+        self.set_deadline("boost", zone_id, boost_until, {"temp": boost_temp})
         
-        task = self.hass.async_create_task(_disable_later())
-        self.zone_boost_tasks[zone_id] = task
+        # update temps immediately
+        self.request_update(zone_id)
  
     def stop_boost(self, zone_id: str):
         """stop boost for this zone"""
-        if zone_id in self.zone_boost_data:
-            self.zone_boost_data[zone_id]["active"] = False
-            _LOGGER.info(f"Zone {zone_id}: Boost stopped")
+        if zone_id in self.zones:
+            self._end_boost(zone_id)
         
-            # cancel task
-            if zone_id in self.zone_boost_tasks:
-                task = self.zone_boost_tasks[zone_id]
-                if not task.done():
-                    task.cancel()
-                del self.zone_boost_tasks[zone_id]
+            # trigger update_temps
+            self.request_update(zone_id)   
+    
+    def _end_boost(self, zone_id: str):
+        """Deactivate boost and reset the switch without recalculation."""
+        self.zones[zone_id].boost_active = False
+        _LOGGER.info(f"Zone {zone_id}: Boost stopped")
         
-            # set switch state direct
-            switch_entity_id = f"switch.{zone_id}_boost"
-            self.hass.states.async_set(switch_entity_id, "off")        
+        # cancel boost end
+        self.cancel_deadline("boost", zone_id)
         
-            # trigger update_temps
-            self.hass.async_create_task(self.update_temps())   
+        # set switch state direct
+        switch_entity_id = f"switch.{zone_id}_boost"
+        self.hass.states.async_set(switch_entity_id, "off")        
    
-    def _get_global_boost_duration(self) -> int:
-        """get the global boost-duration."""
-        _default_boost_duration = 10
-        state = self.hass.states.get("number.global_boost_duration")
-        if not state or state.state in ("unknown", "unavailable"):
-            return _default_boost_duration
-        try:
-            return int(float(state.state))
-        except ValueError:
-            return _default_boost_duration
-        
-    def _get_global_boost_temp(self) -> int:
-        """get the global boost temp."""
-        _default_boost_temp = 25.0
-        state = self.hass.states.get("number.global_boost_temp")
-        if not state or state.state in ("unknown", "unavailable"):
-            return _default_boost_temp
-        try:
-            return int(float(state.state))
-        except ValueError:
-            return _default_boost_temp          
-        
     def is_boost_active(self, zone_id: str) -> bool:
         """checks if boost active."""
-        if zone_id not in self.zone_boost_data:
-            return False
-        return self.zone_boost_data[zone_id].get("active", False)
+        zone = self.zones.get(zone_id)
+        return zone.boost_active if zone else False
     
     def get_boost_temp(self, zone_id: str) -> Optional[float]:
         """get the boost temp if active."""
         if not self.is_boost_active(zone_id):
             return None
-        return self.zone_boost_data[zone_id].get("temp")
+        return self.zones[zone_id].boost_temp
     
     def get_boost_until(self, zone_id: str) -> Optional[datetime]:
         """get the boost end time."""
-        if zone_id not in self.zone_boost_data:
-            return None
-        return self.zone_boost_data[zone_id].get("until")
+        zone = self.zones.get(zone_id)
+        return zone.boost_until if zone else None
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Scheduler (next schedule change, boost end, window delay end)
+# -----------------------------------------------------------------------------
+
+    def _update_profile_changes(self, topics: set):
+        """Set the next schedule change for all profiles in use."""
+        now = datetime.now()
+        for topic in self._scheduled_topics - topics:
+            self._scheduler.cancel(("profile", topic))
+        
+        for topic in topics:
+            self._set_profile_deadline(topic, now)
+        
+        self._scheduled_topics = topics
+    
+    def _set_profile_deadline(self, topic: str, now: datetime):
+        """Set the next schedule change of a profile, cancel it without one."""
+        profile = self.profiles.get(topic)
+        next_change = profile.next_change(now) if profile else None
+        if next_change:
+            self._scheduler.set(("profile", topic), next_change)
+        else:
+            self._scheduler.cancel(("profile", topic))
+    
+    def _arm_scheduler(self):
+        """Arm one timer for the earliest deadline."""
+        next_deadline = self._scheduler.next_deadline()
+        if next_deadline == self._scheduler_armed:
+            return
+        
+        if self._scheduler_unsub:
+            self._scheduler_unsub()
+            self._scheduler_unsub = None
+        
+        self._scheduler_armed = next_deadline
+        if next_deadline is None:
+            _LOGGER.debug("Scheduler idle")
+            return
+        
+        # deadlines are local time, the timer needs an aware datetime
+        self._scheduler_unsub = async_track_point_in_time(
+            self.hass, self._on_scheduler_fired, next_deadline.astimezone()
+        )
+        _LOGGER.debug(f"Scheduler armed for {next_deadline}")
+    
+    def register_deadline_handler(self, kind: str, on_fired, on_restore=None):
+        """Adds a kind of timed deadline, stored if on_restore is given."""
+        self._deadline_handlers[kind] = (on_fired, on_restore)
+    
+    def set_deadline(self, kind: str, key, when: datetime, data: Optional[dict] = None):
+        """Sets or replaces a deadline and arms the timer."""
+        self._scheduler.set((kind, key), when, data)
+        if self._deadline_handlers[kind][1]:
+            self._save_deadlines()
+        self._arm_scheduler()
+    
+    def cancel_deadline(self, kind: str, key):
+        """Removes a deadline, the timer is re-armed when it fires."""
+        if self._scheduler.get((kind, key)) is None:
+            return
+        self._scheduler.cancel((kind, key))
+        if self._deadline_handlers[kind][1]:
+            self._save_deadlines()
+    
+    async def _on_scheduler_fired(self, now=None):
+        """Handle all due deadlines and recalculate once."""
+        self._scheduler_unsub = None
+        self._scheduler_armed = None
+        
+        now = datetime.now()
+        stored = False
+        for (kind, key), data in self._scheduler.pop_due(now):
+            on_fired, on_restore = self._deadline_handlers.get(kind, (None, None))
+            if on_fired is None:
+                _LOGGER.warning(f"No handler for deadline {kind} {key}")
+                continue
+            on_fired(key, data, now)
+            stored = stored or on_restore is not None
+        
+        if stored:
+            self._save_deadlines()
+        
+        # the update run arms the timer again
+        self._arm_scheduler()
+    
+    def _on_boost_deadline(self, zone_id: str, data: Optional[dict], now: datetime):
+        self._end_boost(zone_id)
+        self.request_update(zone_id)
+    
+    def _on_window_deadline(self, zone_id: str, data: Optional[dict], now: datetime):
+        zone = self._zone(zone_id)
+        old_state = zone.window.state
+        changed = zone.window.on_deadline(now, zone.window_delay, self.settings)
+        _LOGGER.info(f"Zone {zone_id}: Window {old_state} -> {zone.window.state}")
+        self._sync_window(zone_id, changed)
+    
+    def _on_override_deadline(self, key, data: Optional[dict], now: datetime):
+        _LOGGER.debug("Override starts or ends")
+        self.overrides.prune(now)
+        self.request_update()
+    
+    def _on_profile_deadline(self, topic: str, data: Optional[dict], now: datetime):
+        _LOGGER.debug(f"Topic {topic}: Schedule change")
+        self._set_profile_deadline(topic, now)
+        for zone_id in self._topic_zones.get(topic, ()):
+            if self._zone_schedule_topics.get(zone_id) == topic:
+                self.request_update(zone_id)
+    
+    def _on_cleanup_deadline(self, key, data: Optional[dict], now: datetime):
+        if self.overrides.prune(now):
+            self.request_update()
+        self.hass.async_create_task(self._cleanup_profiles())
+    
+    def _save_deadlines(self):
+        self._deadline_store.async_delay_save(self._deadlines_to_save, 1)
+    
+    def _deadlines_to_save(self) -> dict:
+        """Stored deadlines (boost, window lockout) as plain data."""
+        return {"deadlines": [
+            {"kind": kind, "key": key, "when": when.isoformat(), "data": data}
+            for (kind, key), when, data in self._scheduler.items()
+            if self._deadline_handlers.get(kind, (None, None))[1]
+        ]}
+    
+    async def _load_deadlines(self):
+        """Restore stored deadlines after a restart."""
+        stored = await self._deadline_store.async_load() or {}
+        now = datetime.now()
+        for item in stored.get("deadlines", []):
+            try:
+                kind = item["kind"]
+                key = item["key"]
+                when = datetime.fromisoformat(item["when"])
+                data = item.get("data")
+            except (KeyError, TypeError, ValueError) as e:
+                _LOGGER.warning(f"Skipping invalid stored deadline {item}: {e}")
+                continue
+            
+            on_restore = self._deadline_handlers.get(kind, (None, None))[1]
+            if on_restore and on_restore(key, when, data, now):
+                self._scheduler.set((kind, key), when, data)
+        _LOGGER.info(f"Restored {len(self._scheduler)} deadlines")
+    
+    def _restore_boost(self, zone_id: str, when: datetime, data: Optional[dict], now: datetime) -> bool:
+        """Boost still running after a restart, or reset the restored switch."""
+        if when <= now:
+            self.hass.states.async_set(f"switch.{zone_id}_boost", "off")
+            return False
+        zone = self._zone(zone_id)
+        zone.boost_active = True
+        zone.boost_until = when
+        zone.boost_temp = (data or {}).get("temp", self.settings.boost_temp)
+        return True
+    
+    def _restore_window(self, zone_id: str, when: datetime, data: Optional[dict], now: datetime) -> bool:
+        """Window lockout or minimum closed time still running after a restart."""
+        state = (data or {}).get("state", WindowState.OPEN)
+        if when <= now or state not in (WindowState.OPEN, WindowState.CLOSING):
+            return False
+        self._zone(zone_id).window.restore(state, when)
+        return True
 
 # -----------------------------------------------------------------------------
 # ANCHOR - Profile Manager
@@ -253,53 +701,59 @@ class ProfileManager:
         """Starts the profile manager."""
         _LOGGER.info("Starting MQTT Profile Manager")
         
-        self.retrys = 0
+        await self.overrides.async_load()
+        await self._load_deadlines()
         await self._setup_mqtt()
         
         # Wait until all entities are ready.
         await asyncio.sleep(5)
+        self._track_states()
         self._startup_complete = True
     
-        # Start polling timer (every 60 seconds)
-        self._polling_unsub = async_track_time_interval(
-            self.hass,
-            self.update_temps,
-            timedelta(seconds=60)
-        )
+        # first calculation, arms the scheduler for the next change
+        await self.update_temps()
     
     async def stop(self):
         """Stoppt den Profile Manager und räumt auf."""
         _LOGGER.info("Stopping MQTT Profile Manager")
         
-        # cancel all boost tasks
-        for zone_id, task in list(self.zone_boost_tasks.items()):
-            if not task.done():
-                task.cancel()
-        self.zone_boost_tasks.clear()        
+        # cancel the one scheduler timer, store boost/window deadlines for the restart
+        if self._scheduler_unsub:
+            self._scheduler_unsub()
+            self._scheduler_unsub = None
+        self._scheduler_armed = None
+        await self._deadline_store.async_save(self._deadlines_to_save())
+        self._scheduler.clear()
         
-        # cancel all window timer
-        for zone_id, timer in list(self.zone_window_timers.items()):
-            if timer:
-                timer()
-        self.zone_window_timers.clear()
+        if self._update_task:
+            self._update_task.cancel()
+            self._update_task = None
         
-        if self._polling_unsub:
-            self._polling_unsub()
-            self._polling_unsub = None
+        if self._state_unsub:
+            self._state_unsub()
+            self._state_unsub = None
         
-        if self._mqtt_client:
+        if self._mqtt:
             try:
-                self._mqtt_client.loop_stop()
-                self._mqtt_client.disconnect()
+                await self._mqtt.disconnect()
             except Exception:
                 pass
-            self._mqtt_client = None
-            self._mqtt_connected = False
+            self._mqtt = None
+        
+        if self._inbox_handle:
+            self._inbox_handle.cancel()
+            self._inbox_handle = None
+        self._inbox.clear()
+        self._unclaimed.clear()
  
 # -----------------------------------------------------------------------------
 # ANCHOR - mqtt setup und Callbacks
 # ----------------------------------------------------------------------------- 
  
+    @property
+    def _mqtt_connected(self) -> bool:
+        return self._mqtt is not None and self._mqtt.connected
+    
     async def _setup_mqtt(self):
         """Set up MQTT client using credentials from Config."""
         mqtt_config = self.config_entry.data
@@ -309,71 +763,134 @@ class ProfileManager:
         user = mqtt_config.get("mqtt_user", MQTT_USER)
         password = mqtt_config.get("mqtt_password", MQTT_PASSWORD)
         
-        self.retrys = 0
         client_id = f"{DOMAIN}_{self.config_entry.entry_id}"
         
-        self._mqtt_client = mqtt_client.Client(client_id=client_id)
-        
-        if user:
-            self._mqtt_client.username_pw_set(user, password)
-        
-        self._mqtt_client.on_connect = self._on_mqtt_connect
-        self._mqtt_client.on_message = self._on_mqtt_message
-        self._mqtt_client.on_disconnect = self._on_mqtt_disconnect
+        # runs on the event loop, no network thread
+        self._mqtt = MqttTransport(self.hass, client_id, self._on_mqtt_connect, self._on_mqtt_message)
         
         try:
             _LOGGER.info(f"Connecting to MQTT broker {host}:{port}")
-            self._mqtt_client.connect(host, port, 60)
-            self._mqtt_client.loop_start()
+            await self._mqtt.connect(host, port, user, password)
         except Exception as e:
             _LOGGER.error(f"Failed to connect to MQTT broker: {e}")
     
-    def _on_mqtt_connect(self, client, userdata, flags, rc):
-        """Callback if MQTT connection is established."""
-        if rc == 0:
-            _LOGGER.info("Connected to MQTT broker")
-            self._mqtt_connected = True
-            self.retrys = 0
-            # Alle bereits registrierten Profile neu subscriben
-            self.hass.loop.call_soon_threadsafe(
-                lambda: self.hass.async_create_task(self._resubscribe_all())
-            )
-        else:
-            _LOGGER.error(f"MQTT connection failed with code {rc}")
-            self._mqtt_connected = False
-    
-    def _on_mqtt_disconnect(self, client, userdata, rc):
-        """Callback if the MQTT connection is disconnected."""
-        _LOGGER.warning(f"Disconnected from MQTT broker (code {rc})")
-        self._mqtt_connected = False
-        if rc != 0:
-            self.retrys += 1
-            if self.retrys >= MAX_RETRYS:
-                _LOGGER.error("Max MQTT reconnection attempts reached, giving up.")
-                try:
-                    client.loop_stop()
-                    self._mqtt_client = None
-                except Exception as e:
-                    _LOGGER.warning(f"Failed to stop MQTT loop after error: {e}")
-    
-    def _on_mqtt_message(self, client, userdata, msg):
-        """Callback if an MQTT message is received."""
-        full_topic = msg.topic
-        payload = msg.payload.decode('utf-8')
-        
-        def process_message():
-            for topic, profile in self.profiles.items():
-                if full_topic.startswith(topic + "/"):
-                    subtopic = full_topic.split('/')[-1]
-                    profile.update_subtopic(subtopic, payload)
-                    break
-        
-        self.hass.loop.call_soon_threadsafe(process_message)
+    async def _on_mqtt_connect(self):
+        """Called after every (re)connect: subscribe to all registered profiles again."""
+        self.subscribed_topics.clear()
+        await self._resubscribe_all()
+    
+    def _on_mqtt_message(self, full_topic: str, payload: bytes):
+        """Callback if an MQTT message is received (in the event loop).
+        
+        Messages are buffered, the latest payload per topic wins, and
+        applied together in one drain on the next loop tick.
+        """
+        self.mqtt_messages += 1
+        if self._inbox_handle is None:
+            self._inbox_handle = self.hass.loop.call_soon(self._drain_mqtt_messages)
+        self._inbox[full_topic] = payload
+    
+    def _drain_mqtt_messages(self):
+        """Applies the buffered messages, each affected profile is resolved once."""
+        self._inbox_handle = None
+        inbox, self._inbox = self._inbox, {}
+        self.mqtt_drains += 1
+        
+        changed = set()
+        for full_topic, payload in inbox.items():
+            # profiles are keyed by their exact prefix, wildcards also deliver
+            # foreign profiles and sub-topics
+            topic, _, subtopic = full_topic.rpartition("/")
+            if subtopic not in FIELD_HANDLERS:
+                continue
+            
+            try:
+                payload = payload.decode('utf-8')
+            except UnicodeDecodeError as e:
+                # one broken payload must not drop the rest of the batch
+                _LOGGER.warning(f"Topic {full_topic}: Payload is not UTF-8: {e}")
+                continue
+            profile = self.profiles.get(topic)
+            if profile is None:
+                # the broker sends retained payloads only once, kept until add_profile
+                if self._subscribe_all:
+                    self._unclaimed.setdefault(topic, {})[subtopic] = payload
+                continue
+            if profile.own.get(subtopic) == payload:
+                continue
+            profile.own[subtopic] = payload
+            changed.add(topic)
+            
+            # load a newly declared base profile
+            if subtopic == BASE_SUBTOPIC:
+                base_topic = profile.get_base_topic()
+                if base_topic and base_topic not in self.profiles:
+                    self.hass.async_create_task(self.add_profile(base_topic))
+        
+        if changed:
+            self._resolve_profiles(changed)
+    
+    def _get_chain(self, topic: str) -> list:
+        """The profile and its base profiles, nearest first."""
+        chain = []
+        while topic and topic in self.profiles:
+            if topic in chain:
+                _LOGGER.warning(f"Topic {topic}: Circular base profile in {chain}")
+                break
+            chain.append(topic)
+            topic = self.profiles[topic].get_base_topic()
+        return chain
+    
+    def _resolve_profiles(self, changed_topics: set):
+        """Flatten all profiles whose chain contains one of the changed topics."""
+        changed = []
+        for topic, profile in self.profiles.items():
+            chain = self._get_chain(topic)
+            if changed_topics.isdisjoint(chain):
+                continue
+            
+            flattened = {}
+            for member in reversed(chain):
+                flattened.update(self.profiles[member].own)
+            flattened.pop(BASE_SUBTOPIC, None)
+            
+            if not profile.apply(flattened):
+                continue
+            
+            async_dispatcher_send(self.hass, f"{DOMAIN}_profile_update", topic)
+            if profile.is_complete():
+                changed.append(topic)
+        
+        # recalculate the zones using a changed profile
+        for topic in changed:
+            for zone_id in self._topic_zones.get(topic, ()):
+                self.request_update(zone_id)
+        
+        # the schedule of a changed profile may change at another time now
+        rescheduled = self._scheduled_topics.intersection(changed)
+        if rescheduled:
+            now = datetime.now()
+            for topic in rescheduled:
+                self._set_profile_deadline(topic, now)
+            self._arm_scheduler()
     
     async def _resubscribe_all(self):
-        """Subscribes to all already registered profiles again."""
-        for topic in list(self.profiles.keys()):
-            await self._subscribe_profile(topic)
+        """Subscribes to all already registered profiles again, in one SUBSCRIBE."""
+        if self._subscribe_all:
+            subscriptions = {None: [PROFILES_WILDCARD]}
+        else:
+            subscriptions = {topic: [f"{topic}/+"] for topic in self.profiles}
+        
+        full_topics = [full_topic for topics in subscriptions.values() for full_topic in topics]
+        if not full_topics:
+            return
+        try:
+            await self._mqtt.subscribe([(full_topic, 1) for full_topic in full_topics])
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            _LOGGER.warning(f"Resubscribe failed: {e}")
+            return
+        self.subscribed_topics.update(subscriptions)
+        _LOGGER.info(f"Subscribed to {len(full_topics)} topics")
     
 # -----------------------------------------------------------------------------
 # ANCHOR - Profile Management
@@ -390,9 +907,17 @@ class ProfileManager:
             _LOGGER.debug(f"Profile {topic} already exists, marked as accessed")
             return
         
-        self.profiles[topic] = ProfileData(topic)
+        profile = self.profiles[topic] = ProfileData(topic)
+        profile.own.update(self._unclaimed.pop(topic, {}))
         _LOGGER.info(f"Added new profile for topic: {topic}")
         
+        # profiles may already wait for this base
+        self._resolve_profiles({topic})
+        
+        base_topic = profile.get_base_topic()
+        if base_topic and base_topic not in self.profiles:
+            self.hass.async_create_task(self.add_profile(base_topic))
+        
         await self._subscribe_profile(topic)
     
     async def remove_profile(self, topic: str):
@@ -401,11 +926,17 @@ class ProfileManager:
             return
         
         await self._unsubscribe_profile(topic)
-        del self.profiles[topic]
+        profile = self.profiles.pop(topic)
+        if self._subscribe_all:
+            self._unclaimed[topic] = profile.own
         _LOGGER.info(f"Removed profile for topic: {topic}")
     
     async def _subscribe_profile(self, topic: str):
-        """Subscribe to all subtopics for a profile."""
+        """Subscribe to all subtopics of a profile with one wildcard."""
+        if self._subscribe_all:
+            # heatzone/profiles/# covers all profiles, filtered locally
+            return
+        
         if not self._mqtt_connected:
             _LOGGER.warning("MQTT not connected, cannot subscribe")
             return
@@ -414,27 +945,314 @@ class ProfileManager:
             _LOGGER.debug(f"Topic {topic} already subscribed")
             return
         
-        full_topics = []
-        for subtopic in PROFILE_SUBTOPICS:
-            full_topic = f"{topic}/{subtopic}"
-            self._mqtt_client.subscribe(full_topic, qos=1)
-            full_topics.append(full_topic)
-            _LOGGER.debug(f"Subscribed to {full_topic}")
+        full_topic = f"{topic}/+"
+        self.subscribed_topics[topic] = [full_topic]
+        try:
+            await self._mqtt.subscribe([(full_topic, 1)])
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            # subscribed again after the reconnect
+            self.subscribed_topics.pop(topic, None)
+            _LOGGER.warning(f"Topic {topic}: Subscribe failed: {e}")
+            return
         
-        self.subscribed_topics[topic] = full_topics
-        _LOGGER.info(f"Topic {topic}: Subscribed to {len(full_topics)} sub-topics")
+        _LOGGER.info(f"Topic {topic}: Subscribed to {full_topic}")
     
     async def _unsubscribe_profile(self, topic: str):
         """Unsubscribed from all sub-topics for a profile."""
         if topic not in self.subscribed_topics:
             return
         
-        for full_topic in self.subscribed_topics[topic]:
-            self._mqtt_client.unsubscribe(full_topic)
-            _LOGGER.debug(f"Unsubscribed from {full_topic}")
+        full_topics = self.subscribed_topics.pop(topic)
+        if not self._mqtt_connected:
+            return
+        try:
+            await self._mqtt.unsubscribe(full_topics)
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            _LOGGER.warning(f"Topic {topic}: Unsubscribe failed: {e}")
+            return
+        
+        _LOGGER.info(f"Topic {topic}: Unsubscribed from {', '.join(full_topics)}")
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Overrides (absent, holiday, fixed temperature for a date range)
+# -----------------------------------------------------------------------------
+
+    def add_override(self, override_type: str, start: datetime, end: datetime,
+                     zone_id: Optional[str] = None, profile: Optional[str] = None,
+                     temp: Optional[float] = None) -> dict:
+        """Add an override for a zone or profile and recalculate."""
+        if zone_id:
+            target = OverrideStore.zone_target(zone_id)
+        else:
+            target = OverrideStore.profile_target(PREFIX_TOPIC + profile.lower())
         
-        del self.subscribed_topics[topic]
-        _LOGGER.info(f"Topic {topic}: Unsubscribed all sub-topics")  
+        override = self.overrides.add(target, override_type, start, end, temp)
+        self.request_update()
+        return override.as_dict()
+    
+    def remove_override(self, override_id: str) -> bool:
+        """Remove an override and recalculate."""
+        removed = self.overrides.remove(override_id)
+        if removed:
+            self.request_update()
+        return removed
+    
+    def _get_zone_inputs(self, zone_id: str, topic: Optional[str], now: datetime) -> ZoneInputs:
+        """Engine inputs of a zone from the mirrored states and the runtime state."""
+        zone = self._zone(zone_id)
+        override = self.overrides.get_active(zone_id, topic, now)
+        return ZoneInputs(
+            mode=zone.mode,
+            present=zone.present != "off",
+            manual_temp=zone.manual_temp,
+            topic=topic,
+            override_type=override.type if override else None,
+            override_temp=override.temp if override else None,
+            boost_temp=zone.boost_temp if zone.boost_active else None,
+            window_open=zone.window.applied,
+        )
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Timeline (projected target temperatures)
+# -----------------------------------------------------------------------------
+
+    def get_timeline(self, days: int = 1) -> dict:
+        """Projected target temperature of all zones as change points."""
+        now = datetime.now()
+        end = now + timedelta(days=days)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        # change points are built from today 0:00 for 8 days
+        if self._timeline_day != today:
+            self._timeline_cache.clear()
+            self._timeline_day = today
+        
+        now_ts = int(now.timestamp())
+        end_ts = int(end.timestamp())
+        zones = {}
+        for zone_id in self._get_zone_ids():
+            inputs = self._get_timeline_inputs(zone_id)
+            cached = self._timeline_cache.get(zone_id)
+            if cached is None or cached[0] != inputs:
+                cached = (inputs, self._build_timeline(zone_id, inputs, today))
+                self._timeline_cache[zone_id] = cached
+            
+            points = cached[1]
+            index = max(0, bisect_right(points, (now_ts, float("inf"))) - 1)
+            timeline = [[now_ts, points[index][1]]]
+            for ts, temp in points[index + 1:]:
+                if ts >= end_ts:
+                    break
+                timeline.append([ts, temp])
+            zones[zone_id] = timeline
+        
+        return {"start": now_ts, "end": end_ts, "zones": zones}
+    
+    def _get_timeline_inputs(self, zone_id: str) -> tuple:
+        """All inputs that define the timeline of a zone."""
+        topic = self.get_topic(zone_id)
+        profile = self.profiles.get(topic) if topic else None
+        zone = self._zone(zone_id)
+        return (
+            ZoneInputs(mode=zone.mode, present=zone.present != "off",
+                       manual_temp=zone.manual_temp, topic=topic),
+            (id(profile), profile.revision) if profile else None,
+            (zone.boost_until, zone.boost_temp) if zone.boost_active else None,
+            zone.window.state,
+            zone.window.deadline,
+            self.overrides.revision,
+        )
+    
+    def _build_timeline(self, zone_id: str, inputs: tuple, day_start: datetime) -> list:
+        """Change points [(timestamp, temp)] from day_start over 8 days."""
+        zone_inputs, _, boost, window_state, window_until, _ = inputs
+        topic = zone_inputs.topic
+        horizon = 8 * SLOTS_PER_DAY
+        profile = self.profiles.get(topic) if topic else None
+        if profile and not profile.is_complete():
+            profile = None
+        
+        # the engine decides, the schedule of the profile is expanded here
+        engine = TargetEngine(_profile_temp_lookup(profile), self.engine.clock)
+        base = engine.evaluate_base(zone_inputs, day_start)
+        schedule = profile if base.scheduled else None
+        
+        # minutes from day_start
+        points = [(0, base.target_temp)]
+        if schedule:
+            first = day_start.weekday() * SLOTS_PER_DAY
+            points = [(0, schedule.get_temp_at_minute(first))]
+            for week in range(2):
+                for change in schedule.changes:
+                    minute = change - first + week * SLOTS_PER_WEEK
+                    if 0 < minute < horizon:
+                        points.append((minute, schedule.get_temp_at_minute(change)))
+        
+        def minutes(when: Optional[datetime]) -> int:
+            return max(0, min(horizon, int((when - day_start).total_seconds() // 60)))
+        
+        # overrides, then boost until its end, then window (0°C) after the delay
+        horizon_end = day_start + timedelta(minutes=horizon)
+        for start, end, override in self.overrides.get_periods(zone_id, topic, day_start, horizon_end):
+            temp = engine.evaluate_override(zone_inputs, override.type, override.temp, start)
+            if temp is not None:
+                points = _overlay(points, minutes(start), minutes(end), temp)
+        
+        if boost:
+            temp = engine.evaluate(zone_inputs._replace(boost_temp=boost[1]), day_start).target_temp
+            points = _overlay(points, 0, minutes(boost[0]), temp)
+        window_temp = engine.evaluate(zone_inputs._replace(window_open=True), day_start).target_temp
+        if window_state in (WindowState.APPLIED, WindowState.CLOSING):
+            points = _overlay(points, 0, horizon, window_temp)
+        elif window_state == WindowState.OPEN and window_until:
+            points = _overlay(points, minutes(window_until), horizon, window_temp)
+        
+        timeline = []
+        for minute, temp in points:
+            if timeline and timeline[-1][1] == temp:
+                continue
+            when = day_start + timedelta(minutes=minute)
+            timeline.append((int(when.timestamp()), temp))
+        
+        _LOGGER.debug(f"Zone {zone_id}: Timeline with {len(timeline)} change points")
+        return timeline
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Batch updates (many zones, one recalculation)
+# -----------------------------------------------------------------------------
+
+    def register_zone_entity(self, zone_id: str, field: str, entity):
+        """Entity that applies a zone attribute of set_zones."""
+        self._zone_entities[(zone_id, field)] = entity
+    
+    def unregister_zone_entity(self, zone_id: str, field: str, entity):
+        if self._zone_entities.get((zone_id, field)) is entity:
+            del self._zone_entities[(zone_id, field)]
+    
+    @contextlib.asynccontextmanager
+    async def batch(self):
+        """Update requests inside only mark zones dirty, one recalculation at the end.
+
+        A running recalculation finishes first; none starts before the last
+        batch ends, so no zone is recalculated half-applied.
+        """
+        async with self._update_lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0:
+            await self.update_dirty_zones()
+    
+    async def set_zones(self, changes: Dict[str, dict]) -> dict:
+        """Sets attributes (mode, present, manual_temp, boost, profile) of many zones.
+
+        changes: {zone_id: {field: value}}. All entities are checked before
+        anything is set, then the zones are recalculated once.
+        """
+        missing = [f"{zone_id}.{field}" for zone_id, values in changes.items()
+                   for field in values if (zone_id, field) not in self._zone_entities]
+        if missing:
+            raise ValueError(f"No entity for {', '.join(missing)}")
+        
+        runs = self.update_runs
+        async with self.batch():
+            for zone_id, values in changes.items():
+                zone = self._zone(zone_id)
+                for field, value in values.items():
+                    entity = self._zone_entities[(zone_id, field)]
+                    await entity.async_apply_batch(value)
+                    # the mirrored state is current before the recalculation
+                    if field in ZONE_ENTITY_FIELDS:
+                        state = self.hass.states.get(entity.entity_id)
+                        zone.set_state(field, state.state if state else None)
+        
+        _LOGGER.info(f"Set {len(changes)} zones in {self.update_runs - runs} update run(s)")
+        return {"zones": {
+            zone_id: {
+                "mode": self.zones[zone_id].mode,
+                "present": self.zones[zone_id].present,
+                "manual_temp": self.zones[zone_id].manual_temp,
+                "profile": self.zones[zone_id].profile,
+                "boost": self.zones[zone_id].boost_active,
+                "target_temp": self.zones[zone_id].last_temp,
+            } for zone_id in changes
+        }}
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Estimate (annual setpoint-hours of schedules, what-if)
+# -----------------------------------------------------------------------------
+
+    async def estimate(self, candidates: list, year: Optional[int] = None) -> dict:
+        """Setpoint-hours over a year for loaded profiles and proposed edits.
+
+        candidates: [{"name": ..., "profile": ..., "data": {subtopic: payload},
+                      "zones": [...]}]
+        """
+        start = datetime(year or datetime.now().year, 1, 1)
+        end = start.replace(year=start.year + 1)
+        slots = (end - start).days * 24 * SLOTS_PER_HOUR
+        first_slot = start.weekday() * 24 * SLOTS_PER_HOUR
+
+        configured = self._get_zone_ids()
+        jobs = []
+        for index, candidate in enumerate(candidates):
+            profile = self._get_estimate_profile(candidate)
+            topic = profile.topic
+            zone_ids = candidate.get("zones")
+            if zone_ids is None:
+                zone_ids = [z for z in configured if self.get_topic(z) == topic]
+            unknown = [zone_id for zone_id in zone_ids if zone_id not in configured]
+            if unknown:
+                raise ValueError(f"Unknown zones {', '.join(unknown)}")
+
+            week = build_week(profile.days, {temp_id: profile.get_temp_by_id(temp_id)
+                                             for temp_id in (1, 2, 3, 4, TEMP_ID_OFF)}, TEMP_FALLBACK)
+            zones = [(zone_id, self._zone(zone_id).priority,
+                      self._get_estimate_periods(zone_id, topic, profile, start, end))
+                     for zone_id in zone_ids]
+            name = candidate.get("name") or candidate.get("profile") or f"candidate_{index + 1}"
+            jobs.append((name, week, first_slot, slots, zones))
+
+        results = await async_estimate(self.hass, jobs)
+        return {"year": start.year, "candidates": results}
+
+    def _get_estimate_profile(self, candidate: dict) -> ProfileData:
+        """Loaded profile, or a copy compiled with the proposed payloads."""
+        name = candidate.get("profile")
+        topic = PREFIX_TOPIC + name.lower() if name else None
+        data = candidate.get("data")
+        if topic and not data:
+            profile = self.profiles.get(topic)
+            if not profile or not profile.is_complete():
+                raise ValueError(f"Profile {name} is not loaded or incomplete")
+            return profile
+
+        flattened = dict(self.profiles[topic].data) if topic in self.profiles else {}
+        flattened.update({k: v if isinstance(v, str) else json.dumps(v)
+                          for k, v in (data or {}).items() if k != BASE_SUBTOPIC})
+        profile = ProfileData(topic or f"{PREFIX_TOPIC}candidate")
+        profile.apply(flattened)
+        if not profile.is_complete():
+            raise ValueError(f"Candidate {candidate.get('name') or name} is incomplete")
+        return profile
+
+    def _get_estimate_periods(self, zone_id: str, topic: str, profile: ProfileData,
+                              start: datetime, end: datetime) -> list:
+        """Overrides of a zone in the period as [(start_slot, end_slot, setpoint)]."""
+        # the zone follows the schedule of the (candidate) profile
+        engine = TargetEngine(_profile_temp_lookup(profile), self.engine.clock)
+        zone_inputs = ZoneInputs(mode=HeaterMode.PROFIL.value, topic=topic)
+        periods = []
+        for period_start, period_end, override in self.overrides.get_periods(zone_id, topic, start, end):
+            temp = engine.evaluate_override(zone_inputs, override.type, override.temp, period_start)
+            periods.append((
+                int((period_start - start).total_seconds() // (SLOT_MINUTES * 60)),
+                int((period_end - start).total_seconds() // (SLOT_MINUTES * 60)),
+                temp,
+            ))
+        return periods
 
 # -----------------------------------------------------------------------------
 # ANCHOR - Temperature Calculation
@@ -445,95 +1263,107 @@ class ProfileManager:
         zones = self.config_entry.options.get("zones", {})
         return list(zones.keys())
     
-    def _get_entity_state(self, zone_id: str, entity_type: str) -> str:
-        """Get the state of an entity for a zone."""
-        
-        # Mapping von entity_type zu tatsächlichen Entity Namen
-        entity_mapping = {
-            "mode": f"select.{zone_id}_mode",
-            "profile": f"text.{zone_id}_profile",
-            "temp_sensor": f"sensor.{zone_id}_temperature_sensor",
-            "manual_temp": f"number.{zone_id}_manual_temp",
-            "window_delay": f"number.{zone_id}_delay",
-            "priority": f"number.{zone_id}_priority",
-            "present": f"switch.{zone_id}_present",
+    def _zone(self, zone_id: str) -> ZoneRuntime:
+        """Get the runtime record of a zone, created on first use."""
+        zone = self.zones.get(zone_id)
+        if zone is None:
+            zone = self.zones[zone_id] = ZoneRuntime(zone_id)
+        return zone
+    
+    def _track_states(self):
+        """Mirror zone and global entity states into the runtime records."""
+        self._entity_fields = {
+            entity_id: (None, field) for entity_id, field in self.settings.entity_ids().items()
         }
-     
-        entity_id = entity_mapping.get(entity_type)
-        if not entity_id:
-            _LOGGER.warning(f"Unknown entity type: {entity_type}")
-            return None
+        for zone_id in self._get_zone_ids():
+            for entity_id, field in self._zone(zone_id).entity_ids().items():
+                self._entity_fields[entity_id] = (zone_id, field)
         
-        state = self.hass.states.get(entity_id)
-        if state:
-            return state.state
-        return None
+        for entity_id in self._entity_fields:
+            state = self.hass.states.get(entity_id)
+            self._set_entity_state(entity_id, state.state if state else None)
+        
+        self._state_unsub = async_track_state_change_event(
+            self.hass, list(self._entity_fields), self._on_state_changed)
+    
+    @callback
+    def _on_state_changed(self, event):
+        """Store the new state of a tracked entity."""
+        new_state = event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+        self._set_entity_state(entity_id, new_state.state if new_state else None)
+        
+        # a global setting (hysteresis, boost, window) can change every zone
+        zone_id, field = self._entity_fields[entity_id]
+        if zone_id is None:
+            async_dispatcher_send(self.hass, f"{DOMAIN}_global_settings_update", field)
+            self.request_update()
+    
+    def _set_entity_state(self, entity_id: str, state: Optional[str]):
+        zone_id, field = self._entity_fields[entity_id]
+        record = self.settings if zone_id is None else self._zone(zone_id)
+        record.set_state(field, state)
+    
+    def set_current_temp(self, zone_id: str, temp: float):
+        """Called by the temperature sensor with the calibrated temperature."""
+        self._zone(zone_id).current_temp = temp
     
     async def _update_target_temp_sensor(self, zone_id: str, temp: float):
         """Update target temp sensor only if changed."""
         
-        last_temp = self.zone_last_temps.get(zone_id)
+        zone = self._zone(zone_id)
+        last_temp = zone.last_temp
         if last_temp is not None and abs(last_temp - temp) < 0.1:
             _LOGGER.debug(f"Zone {zone_id}: Temp unchanged ({temp}°C), skipping update")
             return
        
         async_dispatcher_send(self.hass, f"zone_target_temp_update_{zone_id}", temp)
         
-        self.zone_last_temps[zone_id] = temp
+        zone.last_temp = temp
         _LOGGER.debug(f"Zone {zone_id}: Updated target temp to {temp}°C")
 
+    def get_circuit(self, zone_id: str) -> Optional[DemandGroup]:
+        """The heating circuit of a zone, if assigned."""
+        zone = self.config_entry.options.get("zones", {}).get(zone_id, {})
+        return self.circuits.get(zone.get("circuit"))
+    
+    @property
+    def global_temp_diff(self) -> Optional[float]:
+        return self.global_group.temp_diff
+    
+    @property
+    def global_heating_demand(self) -> bool:
+        return self.global_group.demand
+    
+    async def _update_circuit(self, circuit: DemandGroup):
+        """Update sensors and heating demand of one heating circuit."""
+        temp = circuit.get_mean()
+        circuit.compute_stats()
+        circuit.temp_diff = temp
+        circuit.update_demand(temp, circuit.hysteresis)
+        async_dispatcher_send(self.hass, f"{DOMAIN}_circuit_update_{circuit.group_id}")
+    
     async def _update_global_temp_diff(self, temp: float):
         """Update temp diff sensor and check heating demand with hysteresis."""
-        last_temp = self.global_temp_diff
+        last_temp = self.global_group.temp_diff
         
         # Update temp diff sensor only if changed
         if last_temp is not None and abs(last_temp - temp) < 0.1:
             _LOGGER.debug(f"Global Temp diff unchanged ({temp}°C), skipping update")
-            return
+        else:
+            async_dispatcher_send(self.hass, f"{DOMAIN}_global_temp_diff_update", temp)
+            self.global_group.temp_diff = temp
+            _LOGGER.debug(f"Update Temp Diff {temp}")
         
-        async_dispatcher_send(self.hass, f"{DOMAIN}_global_temp_diff_update", temp)
-        self.global_temp_diff = temp
-        _LOGGER.debug(f"Update Temp Diff {temp}")
-        
-        # Check heating demand with hysteresis
-        hysteresis = self._get_global_hysteresis()
-        current_demand = self.global_heating_demand
-        new_demand = current_demand
-        
-        # Hysteresis-logic
-        if not current_demand and temp > hysteresis:
-            # Switch-on: Difference across hysteresis
-            new_demand = True
-            _LOGGER.info("Global Heating ON: Δ=%.2f°C > %.2f°C", temp, hysteresis)
-        
-        elif current_demand and temp <= 0:
-            # Switch-off: Difference <= 0
-            new_demand = False
-            _LOGGER.info("Global Heating OFF: Δ=%.2f°C <= 0°C", temp)
-        
-        # Change state if necessary
-        if new_demand != current_demand:
-            self.global_heating_demand = new_demand
+        # Check heating demand with hysteresis on every run, the hysteresis may have changed
+        if self.global_group.update_demand(temp, self.settings.hysteresis):
             async_dispatcher_send(
                 self.hass,
                 f"{DOMAIN}_heating_switch",
-                {"demand": new_demand}
+                {"demand": self.global_group.demand}
             )
     
-    def _get_global_hysteresis(self) -> float:
-        """Get global hysteresis from number entity."""
-        entity_id = "number.global_hysteresis"
-        
-        try:
-            state = self.hass.states.get(entity_id)
-            if state and state.state not in (None, "unknown", "unavailable"):
-                return float(state.state)
-        except (ValueError, TypeError):
-            pass
-        
-        return 0.5  # Default hysteresis
- 
-    def get_temp(self, topic: str, mode: str) -> float:
+    def get_temp(self, topic: str, mode: str, now: Optional[datetime] = None) -> float:
         """Calculates the target temperature for a topic and mode."""
         
         if topic not in self.profiles:
@@ -547,30 +1377,87 @@ class ProfileManager:
             _LOGGER.warning(f"Topic {topic}: Profile incomplete")
             return TEMP_FALLBACK
         
-        if mode == HeaterExtendedMode.BYPASS.value:
-            return TEMP_FALLBACK
-        
-        if mode == HeaterExtendedMode.AWAY.value:
-            try:
-                return float(profile.data.get("TempAway", TEMP_FALLBACK))
-            except (ValueError, TypeError):
-                return TEMP_FALLBACK
-        
-        if mode == HeaterMode.HOLIDAY.value:
-            try:
-                return float(profile.data.get("TempHoliday", TEMP_FALLBACK))
-            except (ValueError, TypeError):
-                return TEMP_FALLBACK
-        
-        if mode == HeaterMode.PROFIL.value:
-            return self._calculate_profile_temp(profile)
-        
-        _LOGGER.warning(f"Topic {topic}: Unknown mode {mode}")
-        return TEMP_FALLBACK
+        return _get_profile_temp(profile, mode, now or datetime.now())
+    
+    def _get_cached_temp(self, topic: str, mode: str, now: datetime) -> float:
+        """get_temp, computed once per cycle for all zones sharing a profile."""
+        slot = now.weekday() * SLOTS_PER_DAY + now.hour * 60 + now.minute
+        key = (topic, mode, slot)
+        
+        temp = self._temp_cache.get(key)
+        if temp is not None:
+            self.temp_cache_hits += 1
+            return temp
+        
+        self.temp_cache_misses += 1
+        temp = self.get_temp(topic, mode, now)
+        self._temp_cache[key] = temp
+        return temp
+    
+    def get_stats(self) -> dict:
+        """Counters for diagnostics."""
+        return {
+            "temp_cache_hits": self.temp_cache_hits,
+            "temp_cache_misses": self.temp_cache_misses,
+            "zone_updates": self.zone_updates,
+            "update_triggers": self.update_triggers,
+            "update_runs": self.update_runs,
+            "mqtt_messages": self.mqtt_messages,
+            "mqtt_drains": self.mqtt_drains,
+            "window_suppressed": self.get_window_suppressed(),
+            "contributions": self.get_contributions(),
+        }
+    
+    def get_contributions(self) -> dict:
+        """Contribution of every zone to the global diff: priority, diff and weighted diff."""
+        return {
+            zone_id: {"priority": prio, "diff": round(diff, 1), "weighted": round(prio * diff, 1)}
+            for zone_id, (prio, diff) in self.global_group.contributions.items()
+        }
        
     # ANCHOR - update_temps
+    def mark_zone_dirty(self, zone_id: Optional[str] = None):
+        """Marks a zone for recalculation, all zones without zone_id."""
+        if zone_id is None:
+            self._all_zones_dirty = True
+        else:
+            self._dirty_zones.add(zone_id)
+    
+    def request_update(self, zone_id: Optional[str] = None, delay: float = 0.0):
+        """Marks a zone dirty and starts at most one coalesced update run.
+
+        Requests during a pending or running update only mark zones dirty;
+        the running task picks them up in one follow-up run. Inside batch()
+        the run starts when the batch ends.
+        """
+        self.mark_zone_dirty(zone_id)
+        self.update_triggers += 1
+        if self._batch_depth:
+            return
+        if self._update_task is None:
+            self._update_task = self.hass.async_create_task(self._run_updates(delay))
+    
+    async def _run_updates(self, delay: float):
+        """Runs update_dirty_zones until no zone is dirty anymore."""
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            # before startup the dirty zones wait for the first full run
+            # inside batch() the end of the batch runs the dirty zones
+            while (self._startup_complete and not self._batch_depth
+                   and (self._dirty_zones or self._all_zones_dirty)):
+                await self.update_dirty_zones()
+        finally:
+            self._update_task = None
+    
     async def update_temps(self, now=None):
         """Pollt und aktualisiert alle Zonen."""
+        self.update_triggers += 1
+        self.mark_zone_dirty()
+        await self.update_dirty_zones()
+    
+    async def update_dirty_zones(self):
+        """Recalculates the dirty zones, the global diff from cached contributions."""
         # startup - do nothing
         if not self._startup_complete:
             # _LOGGER.debug("Startup not complete, skipping temp update")
@@ -578,185 +1465,164 @@ class ProfileManager:
         
         # prevent rekursiv calls
         async with self._update_lock:
+            # zones stay dirty until the batch ends
+            if self._batch_depth:
+                return
+            
+            full = self._all_zones_dirty
+            if full:
+                zone_ids = self._get_zone_ids()
+                for zone_id in set(self.global_group.contributions) - set(zone_ids):
+                    self.global_group.remove_zone(zone_id)
+                    for circuit in self.circuits.values():
+                        circuit.remove_zone(zone_id)
+                    self._set_zone_topic(zone_id, None)
+                    self._zone_topics.pop(zone_id)
+                    self._zone_schedule_topics.pop(zone_id, None)
+            else:
+                configured = self.config_entry.options.get("zones", {})
+                zone_ids = [zone_id for zone_id in self._dirty_zones if zone_id in configured]
+            self._all_zones_dirty = False
+            self._dirty_zones.clear()
             
-            zone_ids = self._get_zone_ids()
+            if not zone_ids and not full:
+                return
+            
+            now = self.engine.now()
+            self._temp_cache.clear()
+            self.update_runs += 1
+            self.zone_updates += len(zone_ids)
             
             _LOGGER.debug(f"Update temps for zones: {zone_ids}")
             
-            # get all used topics
-            used_topics = set()
+            # get topics of the dirty zones
+            zone_topics = {}
             for zone_id in zone_ids:
                 topic = self.get_topic(zone_id)
-                if topic and topic not in ("unknown", "unavailable", ""):
-                    used_topics.add(topic)
+                if topic in ("unknown", "unavailable", ""):
+                    topic = None
+                zone_topics[zone_id] = topic
+                self._set_zone_topic(zone_id, topic)
             
             # load profile for used topics
-            for topic in used_topics:
-                if topic not in self.profiles:
+            for topic in set(zone_topics.values()):
+                if topic and topic not in self.profiles:
                     _LOGGER.info(f"Loading profile for new topic: {topic}")
                     await self.add_profile(topic)
             
-            temp_diff = 0.0
-            temp_count = 0
+            schedule_changed = False
+            contributions_changed = False
+            changed_circuits = set()
             
-            # Calculate target temperatures for zones in profile mode
+            # Calculate target temperatures for the dirty zones
             for zone_id in zone_ids:
-                # get some entity states
-                mode = self._get_entity_state(zone_id, "mode")
-                manual_temp = self._get_entity_state(zone_id, "manual_temp")
-                prio = self._get_entity_state(zone_id, "priority")
-                current_temp = self.zone_current_temp.get(zone_id, DEFAULT_CURRENT_TEMP)
-                present = self._get_entity_state(zone_id, "present")
-                
-                #default target temp
-                target_temp = 0.0  
-                
-                if not mode or mode == HeaterMode.MANUAL.value:
-                    # In manual mode, the user sets the temperature themselves.
-                    target_temp = float(manual_temp) if manual_temp else TEMP_FALLBACK
-    
-                # get topic - composed of prefix-topic/profile
-                topic = self.get_topic(zone_id)       
-                if not topic or topic in ("unknown", "unavailable", ""):
-                    target_temp = TEMP_FALLBACK
-                else:     
-                    # change mode to get the temp if not present
-                    if present == "off": 
-                        mode = HeaterExtendedMode.AWAY.value
-                        target_temp = self.get_temp(topic, mode)
-                    
-                    # Calculate target temperature from profile
-                    if mode == HeaterMode.PROFIL.value or mode == HeaterMode.HOLIDAY.value:
-                        target_temp = self.get_temp(topic, mode)
-                
-                # check for boost
-                if self.is_boost_active(zone_id):
-                    boost_temp = self.get_boost_temp(zone_id)
-                    if boost_temp is not None:
-                        target_temp = boost_temp
-                        _LOGGER.debug(f"Zone {zone_id}: Boost active, using {boost_temp}°C")
-                        
-                # Check for an open window (Only if the lock time has expired!)
-                if self.is_window_open(zone_id) and not self.is_window_delay_active(zone_id):
-                    target_temp = 0.0
-                    _LOGGER.debug(f"Zone {zone_id}: Window open (delay expired), using 0°C")
-                
-                _LOGGER.debug(f"Zone {zone_id}: Calculated temp={target_temp}°C (topic={topic}, mode={mode})")
+                zone = self._zone(zone_id)
+                prio = zone.priority
+                current_temp = zone.current_temp
+                if current_temp is None:
+                    current_temp = DEFAULT_CURRENT_TEMP
                 
-                # change to float
-                try:
-                    prio = float(prio)
-                except (TypeError, ValueError):
-                    prio = 0.0
-                try:
-                    current_temp = float(current_temp)
-                except (TypeError, ValueError):
-                    current_temp = 50                
+                topic = zone_topics[zone_id]
+                decision = self.engine.evaluate(self._get_zone_inputs(zone_id, topic, now), now)
+                target_temp = decision.target_temp
+                _LOGGER.debug(f"Zone {zone_id}: Calculated temp={target_temp}°C ({decision.source}, topic={topic})")
                 
-                # get current diff < 0.0 = 0.0
-                diff = max(0.0, target_temp - current_temp)
+                # topic evaluated by schedule
+                schedule_topic = topic if decision.scheduled and topic in self.profiles else None
+                if self._zone_schedule_topics.get(zone_id) != schedule_topic:
+                    self._zone_schedule_topics[zone_id] = schedule_topic
+                    schedule_changed = True
                 
-                temp_diff = temp_diff + prio * diff
-                temp_count = temp_count + prio
+                # diff < 0.0 = 0.0, cached for the global diff and the circuit of the zone
+                contributions_changed |= self.global_group.set_zone(zone_id, target_temp, current_temp, prio)
+                circuit = self.get_circuit(zone_id)
+                if circuit and circuit.set_zone(zone_id, target_temp, current_temp, prio):
+                    changed_circuits.add(circuit.group_id)
                 
                 # update Target Temperature Sensor
                 await self._update_target_temp_sensor(zone_id, target_temp)
             
-            # set global temp diff
-            if temp_count > 0:
-                await self._update_global_temp_diff(round(temp_diff / temp_count,1))
-            else:
-                await self._update_global_temp_diff(0.0)
+            # set global temp diff from the running sums
+            if full:
+                self.global_group.resync()
+                for circuit in self.circuits.values():
+                    circuit.resync()
+                changed_circuits.update(self.circuits)
+            await self._update_global_temp_diff(self.global_group.get_mean())
+            if contributions_changed:
+                stats = self.global_group.compute_stats()
+                async_dispatcher_send(self.hass, f"{DOMAIN}_demand_update", stats)
             
-            # Cleanup of outdated profiles (not used for >10 minutes)
-            for topic in list(self.profiles.keys()):
-                if topic not in used_topics:
-                    profile = self.profiles[topic]
-                    if profile.is_expired(CLEANUP_TIMEOUT_MINUTES):
-                        _LOGGER.info(f"Cleaning up unused profile: {topic}")
-                        await self.remove_profile(topic)
-
-    def _calculate_profile_temp(self, profile: ProfileData) -> float:
-        """Calculates temperature from daily profile."""
-        now = datetime.now()
-        weekday = now.weekday()
-        current_time = now.strftime("%H:%M")
-        
-        day_key = f"Day{weekday + 1}"
-        day_schedule_str = profile.data.get(day_key)
-        
-        if not day_schedule_str:
-            _LOGGER.warning(f"No schedule for {day_key}")
-            return TEMP_FALLBACK
-        
-        try:
-            day_schedule = json.loads(day_schedule_str)
+            # only the circuits of the dirty zones
+            for circuit_id in changed_circuits:
+                await self._update_circuit(self.circuits[circuit_id])
             
-            for period in day_schedule:
-                from_time = period.get("From", "0:00")
-                to_time = period.get("To", "24:00")
-                temp_id = period.get("TempID", 0)
+            if full:
+                await self._cleanup_profiles()
                 
-                if self._is_time_in_range(current_time, from_time, to_time):
-                    return self._get_temp_by_id(profile, temp_id)
+                next_override = self.overrides.next_boundary(now)
+                if next_override:
+                    self._scheduler.set(("override", None), next_override)
+                else:
+                    self._scheduler.cancel(("override", None))
             
-            _LOGGER.debug(f"No matching period for {current_time}, using fallback")
-            return TEMP_FALLBACK
+            _LOGGER.debug(f"Temp cache: {self.temp_cache_hits} hits, {self.temp_cache_misses} misses")
             
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
-            _LOGGER.error(f"Error parsing schedule: {e}")
-            return TEMP_FALLBACK
+            # wake up at the next schedule change or override boundary
+            if full or schedule_changed:
+                self._update_profile_changes(
+                    {topic for topic in self._zone_schedule_topics.values() if topic})
+            self._arm_scheduler()
+
+    async def _cleanup_profiles(self):
+        """Removes profiles not used for >10 minutes (keeps bases), waits for the others."""
+        keep_topics = set()
+        for topic in self._zone_topics.values():
+            if topic:
+                keep_topics.update(self._get_chain(topic))
+        
+        next_cleanup = None
+        for topic in list(self.profiles.keys()):
+            if topic in keep_topics:
+                continue
+            profile = self.profiles[topic]
+            if profile.is_expired(CLEANUP_TIMEOUT_MINUTES):
+                _LOGGER.info(f"Cleaning up unused profile: {topic}")
+                await self.remove_profile(topic)
+            else:
+                expires = profile.last_access + timedelta(minutes=CLEANUP_TIMEOUT_MINUTES, seconds=1)
+                next_cleanup = expires if next_cleanup is None else min(next_cleanup, expires)
+        
+        if next_cleanup:
+            self.set_deadline("cleanup", None, next_cleanup)
+        else:
+            self.cancel_deadline("cleanup", None)
+    
+    def _set_zone_topic(self, zone_id: str, topic: Optional[str]):
+        """Keeps the topic of a zone and the reverse index {topic: zone_ids}."""
+        old_topic = self._zone_topics.get(zone_id)
+        self._zone_topics[zone_id] = topic
+        if old_topic == topic:
+            return
+        if old_topic in self._topic_zones:
+            self._topic_zones[old_topic].discard(zone_id)
+            if not self._topic_zones[old_topic]:
+                del self._topic_zones[old_topic]
+                # unused from now on, removed after the cleanup timeout
+                if old_topic in self.profiles:
+                    self.profiles[old_topic].mark_accessed()
+                    self.hass.async_create_task(self._cleanup_profiles())
+        if topic:
+            self._topic_zones.setdefault(topic, set()).add(zone_id)
     
     def get_topic(self, zone_id: str) -> Optional[str]:
         """get the MQTT topic for a zone."""
-        profile = self._get_entity_state(zone_id, "profile")
+        profile = self._zone(zone_id).profile
         
         # check if valid
-        if not profile or profile in ("unknown", "unavailable", ""):
+        if not profile:
             _LOGGER.warning(f"Zone {zone_id}: No valid profile configured")
             return None
         
         topic = PREFIX_TOPIC + profile.lower()
         return topic
-    
-    def _is_time_in_range(self, current: str, start: str, end: str) -> bool:
-        """Checks if the current time is within the time range."""
-        try:
-            current_h, current_m = map(int, current.split(":"))
-            start_h, start_m = map(int, start.split(":"))
-            end_h, end_m = map(int, end.split(":"))
-            
-            current_minutes = current_h * 60 + current_m
-            start_minutes = start_h * 60 + start_m
-            end_minutes = end_h * 60 + end_m
-            
-            if end_minutes < start_minutes:
-                return current_minutes >= start_minutes or current_minutes < end_minutes
-            else:
-                return start_minutes <= current_minutes < end_minutes
-                
-        except (ValueError, AttributeError):
-            return False
-    
-    def _get_temp_by_id(self, profile: ProfileData, temp_id: int) -> float:
-        """Mapped TempID to actual temperature."""
-        if temp_id == 0:
-            return TEMP_FALLBACK
-        
-        if temp_id in [1, 2, 3, 4]:
-            temp_key = f"Temp{temp_id}"
-            try:
-                temp_value = profile.data.get(temp_key)
-                if temp_value is None:
-                    _LOGGER.warning(f"{temp_key} not found in profile, using fallback")
-                    return TEMP_FALLBACK
-                return float(temp_value)
-            except (ValueError, TypeError) as e:
-                _LOGGER.error(f"Cannot convert {temp_key} value to float: {e}")
-                return TEMP_FALLBACK
-        
-        if temp_id == 5:
-            return 0.0
-        
-        _LOGGER.warning(f"Unknown TempID {temp_id}, using fallback")
-        return TEMP_FALLBACK
\ No newline at end of file
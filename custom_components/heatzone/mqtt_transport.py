@@ -0,0 +1,202 @@
+# /config/custom_components/heatzone/mqtt_transport.py
+
+import asyncio
+import threading
+from typing import Callable, Dict, Optional
+import paho.mqtt.client as mqtt_client
+from homeassistant.core import HomeAssistant
+from .const import *
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+MQTT_KEEPALIVE = 60
+MQTT_MAX_INFLIGHT = 20          # unacknowledged requests at a time
+MQTT_REQUEST_TIMEOUT = 10       # seconds for SUBACK, UNSUBACK, PUBACK
+MQTT_RECONNECT_DELAY = 5        # seconds, times the number of retries (max. 60)
+MQTT_READ_BATCH = 100           # packets read per readable event
+
+
+class MqttTransport:
+    """paho-mqtt on the Home Assistant event loop, without a network thread.
+
+    The socket is watched with add_reader/add_writer, so all paho callbacks
+    run in the event loop. subscribe, unsubscribe and publish wait for the
+    acknowledgement of the broker; at most MQTT_MAX_INFLIGHT are pending.
+    """
+
+    def __init__(self, hass: HomeAssistant, client_id: str,
+                 on_connect: Callable, on_message: Callable[[str, bytes], None]):
+        self.hass = hass
+        self.loop = hass.loop
+        self._on_connect_cb = on_connect        # async, after every (re)connect
+        self._on_message_cb = on_message        # topic, payload
+
+        self.client = mqtt_client.Client(mqtt_client.CallbackAPIVersion.VERSION2, client_id=client_id)
+        self.client.max_inflight_messages_set(MQTT_MAX_INFLIGHT)
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+        self.client.on_message = self._on_message
+        self.client.on_subscribe = self._on_ack
+        self.client.on_unsubscribe = self._on_ack
+        self.client.on_publish = self._on_ack
+        self.client.on_socket_open = self._on_socket_open
+        self.client.on_socket_close = self._on_socket_close
+        self.client.on_socket_register_write = self._on_socket_register_write
+        self.client.on_socket_unregister_write = self._on_socket_unregister_write
+
+        self.connected = False
+        self.retrys = 0
+        self._received = 0                              # messages, ends a read batch
+        self._closing = False
+        self._pending: Dict[int, asyncio.Future] = {}   # {mid: future of the ack}
+        self._inflight = asyncio.Semaphore(MQTT_MAX_INFLIGHT)
+        self._misc_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def connect(self, host: str, port: int, user: str = "", password: str = ""):
+        """Connect to the broker, the blocking socket connect runs in the executor."""
+        if user:
+            self.client.username_pw_set(user, password)
+        self._closing = False
+        await self.hass.async_add_executor_job(self.client.connect, host, port, MQTT_KEEPALIVE)
+
+    async def disconnect(self):
+        """Disconnect and stop reconnecting."""
+        self._closing = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self.client.disconnect()
+        self._fail_pending(ConnectionError("MQTT client stopped"))
+
+    # ANCHOR - requests
+    async def subscribe(self, topics: list) -> list:
+        """Subscribe [(topic, qos)] in one SUBSCRIBE packet, returns the reason codes."""
+        return await self._request(lambda: self.client.subscribe(topics))
+
+    async def unsubscribe(self, topics: list) -> None:
+        """Unsubscribe [topic] in one UNSUBSCRIBE packet."""
+        await self._request(lambda: self.client.unsubscribe(topics))
+
+    async def publish(self, topic: str, payload, qos: int = 0, retain: bool = False) -> None:
+        """Publish, waits until the message is written (qos 0) or acknowledged."""
+        await self._request(lambda: self._publish(topic, payload, qos, retain))
+
+    def _publish(self, topic, payload, qos, retain) -> tuple:
+        info = self.client.publish(topic, payload, qos, retain)
+        return info.rc, info.mid
+
+    async def _request(self, send: Callable[[], tuple]):
+        """Send a request and wait for its acknowledgement."""
+        async with self._inflight:
+            result, mid = send()
+            if result != mqtt_client.MQTT_ERR_SUCCESS:
+                raise ConnectionError(mqtt_client.error_string(result))
+            future = self.loop.create_future()
+            self._pending[mid] = future
+            try:
+                return await asyncio.wait_for(future, MQTT_REQUEST_TIMEOUT)
+            finally:
+                self._pending.pop(mid, None)
+
+    def _on_ack(self, client, userdata, mid, reason_codes=None, properties=None):
+        future = self._pending.get(mid)
+        if future and not future.done():
+            future.set_result(reason_codes)
+
+    def _fail_pending(self, error: Exception):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    # ANCHOR - connection
+    def _on_connect(self, client, userdata, flags, reason_code, properties):
+        if reason_code.is_failure:
+            _LOGGER.error(f"MQTT connection failed: {reason_code}")
+            self.connected = False
+            return
+        _LOGGER.info("Connected to MQTT broker")
+        self.connected = True
+        self.retrys = 0
+        self.hass.async_create_task(self._on_connect_cb())
+
+    def _on_disconnect(self, client, userdata, flags, reason_code, properties):
+        self.connected = False
+        self._fail_pending(ConnectionError("MQTT connection lost"))
+        if self._closing:
+            return
+        _LOGGER.warning(f"Disconnected from MQTT broker ({reason_code})")
+        if not self._reconnect_task:
+            self._reconnect_task = self.hass.async_create_background_task(
+                self._reconnect(), f"{DOMAIN} mqtt reconnect")
+
+    async def _reconnect(self):
+        """Reconnect with a growing delay, give up after MAX_RETRYS."""
+        try:
+            while not self._closing and not self.connected:
+                self.retrys += 1
+                if self.retrys > MAX_RETRYS:
+                    _LOGGER.error("Max MQTT reconnection attempts reached, giving up.")
+                    return
+                await asyncio.sleep(min(MQTT_RECONNECT_DELAY * self.retrys, 60))
+                try:
+                    await self.hass.async_add_executor_job(self.client.reconnect)
+                    return
+                except OSError as e:
+                    _LOGGER.warning(f"MQTT reconnect failed: {e}")
+        finally:
+            self._reconnect_task = None
+
+    def _on_message(self, client, userdata, msg):
+        self._received += 1
+        self._on_message_cb(msg.topic, msg.payload)
+
+    # ANCHOR - socket callbacks, connect runs in the executor
+    def _call_in_loop(self, func, *args):
+        if threading.get_ident() == self.hass.loop_thread_id:
+            func(*args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+
+    def _on_socket_open(self, client, userdata, sock):
+        self._call_in_loop(self._watch_socket, sock)
+
+    def _on_socket_close(self, client, userdata, sock):
+        self._call_in_loop(self._unwatch_socket, sock)
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        self._call_in_loop(self.loop.add_writer, sock, self.client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        self._call_in_loop(self.loop.remove_writer, sock)
+
+    def _watch_socket(self, sock):
+        self.loop.add_reader(sock, self._loop_read)
+        if not self._misc_task:
+            self._misc_task = self.hass.async_create_background_task(
+                self._misc_loop(), f"{DOMAIN} mqtt keepalive")
+
+    def _unwatch_socket(self, sock):
+        self.loop.remove_reader(sock)
+        self.loop.remove_writer(sock)
+        if self._misc_task:
+            self._misc_task.cancel()
+            self._misc_task = None
+
+    def _loop_read(self):
+        """Reads a burst of messages in one loop callback.
+        
+        paho reads one packet per loop_read; reading continues while
+        packets are messages, up to MQTT_READ_BATCH.
+        """
+        for _ in range(MQTT_READ_BATCH):
+            received = self._received
+            if self.client.loop_read() != mqtt_client.MQTT_ERR_SUCCESS or self._received == received:
+                break
+
+    async def _misc_loop(self):
+        """Keepalive and timeouts, paho's loop_misc once per second."""
+        while self.client.loop_misc() == mqtt_client.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(1)
@@ -24,6 +24,13 @@ async def async_setup_entry(hass, entry, async_add_entities: AddEntitiesCallback
     entities.append(GlobalBoostDurationNumber(hass, entry))
     entities.append(GlobalBoostTemperatureNumber(hass, entry))
     entities.append(GlobalHysteresisNumber(hass, entry))
+    entities.append(GlobalWindowDebounceNumber(hass, entry))
+    entities.append(GlobalWindowMinClosedNumber(hass, entry))
+    entities.append(GlobalWindowMaxResendsNumber(hass, entry))
+    entities.append(GlobalTempFilterTauNumber(hass, entry))
+    entities.append(GlobalTempDeadbandNumber(hass, entry))
+    entities.append(GlobalTempMinIntervalNumber(hass, entry))
+    entities.append(GlobalSourceMaxAgeNumber(hass, entry))
     
     for zone_id in zones:
         entities.append(ZoneManualTemperature(hass, entry, zone_id))
@@ -55,6 +62,9 @@ class ZoneNumberBase(ZoneEntityCore, NumberEntity):
         self.async_write_ha_state()
         _LOGGER.debug(f"Updated {self.entity_id} to {value}")
 
+    async def async_apply_batch(self, value) -> None:
+        await self.async_set_native_value(float(value))
+
 # -----------------------------------------------------------------------------
 # ANCHOR - Global numbers
 # -----------------------------------------------------------------------------
@@ -99,6 +109,102 @@ class GlobalHysteresisNumber(ZoneNumberBase):
     _attr_default_value = 0.5
     _attr_is_global = True 
 
+class GlobalWindowDebounceNumber(ZoneNumberBase):
+    """Time a window contact must keep its state before it counts."""
+    
+    _attr_name_suffix = "Window-Debounce"
+    _attr_unique_suffix = "window_debounce"
+    _attr_icon = "mdi:timer-sand"
+    _attr_native_unit_of_measurement = "s"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 300
+    _attr_native_step = 1
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 5
+    _attr_is_global = True 
+
+class GlobalWindowMinClosedNumber(ZoneNumberBase):
+    """Time a window must stay closed before the temperature is restored."""
+    
+    _attr_name_suffix = "Window-Min-Closed"
+    _attr_unique_suffix = "window_min_closed"
+    _attr_icon = "mdi:window-closed-variant"
+    _attr_native_unit_of_measurement = "s"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 600
+    _attr_native_step = 1
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 30
+    _attr_is_global = True 
+
+class GlobalWindowMaxResendsNumber(ZoneNumberBase):
+    """Max. window caused thermostat changes per zone and hour, 0 = no cap."""
+    
+    _attr_name_suffix = "Window-Max-Resends"
+    _attr_unique_suffix = "window_max_resends"
+    _attr_icon = "mdi:counter"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 60
+    _attr_native_step = 1
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 10
+    _attr_is_global = True 
+
+class GlobalTempFilterTauNumber(ZoneNumberBase):
+    """Time constant of the temperature smoothing, 0 = off."""
+    
+    _attr_name_suffix = "Temp-Filter"
+    _attr_unique_suffix = "temp_filter_tau"
+    _attr_icon = "mdi:chart-bell-curve-cumulative"
+    _attr_native_unit_of_measurement = "s"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 1800
+    _attr_native_step = 10
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 60
+    _attr_is_global = True 
+
+class GlobalTempDeadbandNumber(ZoneNumberBase):
+    """Smaller temperature changes are not passed on."""
+    
+    _attr_name_suffix = "Temp-Deadband"
+    _attr_unique_suffix = "temp_deadband"
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_native_min_value = 0
+    _attr_native_max_value = 1.0
+    _attr_native_step = 0.1
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 0.2
+    _attr_is_global = True 
+
+class GlobalTempMinIntervalNumber(ZoneNumberBase):
+    """Minimum time between two passed on temperatures of a zone."""
+    
+    _attr_name_suffix = "Temp-Min-Interval"
+    _attr_unique_suffix = "temp_min_interval"
+    _attr_icon = "mdi:timer-outline"
+    _attr_native_unit_of_measurement = "s"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 3600
+    _attr_native_step = 10
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 60
+    _attr_is_global = True 
+
+class GlobalSourceMaxAgeNumber(ZoneNumberBase):
+    """Sensors without a changed value for this long are left out of a zone's value."""
+    
+    _attr_name_suffix = "Source-Max-Age"
+    _attr_unique_suffix = "source_max_age"
+    _attr_icon = "mdi:timer-sand"
+    _attr_native_unit_of_measurement = "min"
+    _attr_native_min_value = 0
+    _attr_native_max_value = 1440
+    _attr_native_step = 5
+    _attr_mode = NumberMode.BOX
+    _attr_default_value = 0
+    _attr_is_global = True 
+
 # -----------------------------------------------------------------------------
 # ANCHOR - Zone numbers
 # -----------------------------------------------------------------------------
@@ -107,6 +213,7 @@ class ZoneManualTemperature(ZoneNumberBase):
     """Manually adjustable temperature."""
 
     _attr_name_suffix = "Manual temperature"
+    _batch_field = "manual_temp"
     _attr_unique_suffix = "manual_temp"
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_native_min_value = -2.0
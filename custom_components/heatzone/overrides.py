@@ -0,0 +1,198 @@
+# /config/custom_components/heatzone/overrides.py
+
+import heapq
+import uuid
+from bisect import bisect_right
+from datetime import datetime
+from typing import Optional, Dict
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from .const import *
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+
+class Override:
+    """A date-range override (absent, holiday, fixed temperature) for a zone or profile."""
+
+    def __init__(self, override_id: str, target: str, override_type: str,
+                 start: datetime, end: datetime, temp: Optional[float] = None, seq: int = 0):
+        self.id = override_id
+        self.target = target            # "zone:<zone_id>" or "profile:<name>"
+        self.type = override_type       # OverrideType
+        self.start = start              # local time
+        self.end = end
+        self.temp = temp                # only for OverrideType.TEMPERATURE
+        self.seq = seq                  # later overrides win
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "target": self.target,
+            "type": self.type,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "temp": self.temp,
+            "seq": self.seq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Override":
+        return cls(
+            data["id"],
+            data["target"],
+            data["type"],
+            datetime.fromisoformat(data["start"]),
+            datetime.fromisoformat(data["end"]),
+            data.get("temp"),
+            data.get("seq", 0),
+        )
+
+
+class OverrideIndex:
+    """Elementary interval index: the winning override per gap between boundaries."""
+
+    def __init__(self, overrides: list):
+        self.bounds: list = []      # sorted boundaries
+        self.winners: list = []     # winner for [bounds[i], bounds[i+1])
+
+        events = sorted({ov.start for ov in overrides} | {ov.end for ov in overrides})
+        starts = sorted(overrides, key=lambda ov: ov.start)
+        active = []                 # heap [(-seq, id, override)]
+        index = 0
+        for bound in events:
+            while index < len(starts) and starts[index].start <= bound:
+                ov = starts[index]
+                heapq.heappush(active, (-ov.seq, ov.id, ov))
+                index += 1
+            while active and active[0][2].end <= bound:
+                heapq.heappop(active)
+            self.bounds.append(bound)
+            self.winners.append(active[0][2] if active else None)
+
+    def lookup(self, when: datetime) -> Optional[Override]:
+        """Get the override active at a point in time."""
+        index = bisect_right(self.bounds, when) - 1
+        if index < 0:
+            return None
+        return self.winners[index]
+
+
+class OverrideStore:
+    """Persists overrides and answers lookups through one index per target."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._store = Store(hass, OVERRIDES_STORAGE_VERSION, OVERRIDES_STORAGE_KEY)
+        self.overrides: Dict[str, Override] = {}        # {id: Override}
+        self._indexes: Dict[str, OverrideIndex] = {}    # {target: OverrideIndex}
+        self._bounds: list = []                         # all boundaries, sorted
+        self._seq = 0
+        self.revision = 0
+
+    async def async_load(self):
+        """Load stored overrides."""
+        data = await self._store.async_load() or {}
+        for item in data.get("overrides", []):
+            try:
+                override = Override.from_dict(item)
+            except (KeyError, ValueError, TypeError) as e:
+                _LOGGER.warning(f"Skipping invalid stored override {item}: {e}")
+                continue
+            self.overrides[override.id] = override
+            self._seq = max(self._seq, override.seq)
+        self._rebuild()
+        _LOGGER.info(f"Loaded {len(self.overrides)} overrides")
+
+    def _data_to_save(self) -> dict:
+        return {"overrides": [ov.as_dict() for ov in self.overrides.values()]}
+
+    def _rebuild(self):
+        """Drop ended overrides and rebuild the indexes."""
+        now = datetime.now()
+        for override_id in [ov.id for ov in self.overrides.values() if ov.end <= now]:
+            del self.overrides[override_id]
+
+        by_target: Dict[str, list] = {}
+        for override in self.overrides.values():
+            by_target.setdefault(override.target, []).append(override)
+
+        self._indexes = {target: OverrideIndex(items) for target, items in by_target.items()}
+        self._bounds = sorted({b for index in self._indexes.values() for b in index.bounds})
+        self.revision += 1
+
+    def add(self, target: str, override_type: str, start: datetime, end: datetime,
+            temp: Optional[float] = None) -> Override:
+        """Add an override and persist it."""
+        self._seq += 1
+        override = Override(uuid.uuid4().hex, target, override_type, start, end, temp, self._seq)
+        self.overrides[override.id] = override
+        self._rebuild()
+        self._store.async_delay_save(self._data_to_save, 1)
+        _LOGGER.info(f"Added {override_type} override for {target} from {start} to {end}")
+        return override
+
+    def remove(self, override_id: str) -> bool:
+        """Remove an override and persist the change."""
+        if self.overrides.pop(override_id, None) is None:
+            return False
+        self._rebuild()
+        self._store.async_delay_save(self._data_to_save, 1)
+        _LOGGER.info(f"Removed override {override_id}")
+        return True
+
+    def prune(self, now: datetime) -> bool:
+        """Drop ended overrides from the store and the indexes, True if any."""
+        if not any(ov.end <= now for ov in self.overrides.values()):
+            return False
+        self._rebuild()
+        self._store.async_delay_save(self._data_to_save, 1)
+        return True
+
+    @staticmethod
+    def zone_target(zone_id: str) -> str:
+        return f"zone:{zone_id}"
+
+    @staticmethod
+    def profile_target(topic: Optional[str]) -> Optional[str]:
+        if not topic:
+            return None
+        return f"profile:{topic.removeprefix(PREFIX_TOPIC)}"
+
+    def get_active(self, zone_id: str, topic: Optional[str], when: datetime) -> Optional[Override]:
+        """Override active for a zone; zone overrides win over profile overrides."""
+        if not self._indexes:
+            return None
+
+        index = self._indexes.get(self.zone_target(zone_id))
+        override = index.lookup(when) if index else None
+        if override:
+            return override
+
+        index = self._indexes.get(self.profile_target(topic))
+        return index.lookup(when) if index else None
+
+    def get_periods(self, zone_id: str, topic: Optional[str],
+                    start: datetime, end: datetime) -> list:
+        """Active overrides of a zone in [start, end) as [(start, end, Override)]."""
+        indexes = [index for index in (
+            self._indexes.get(self.zone_target(zone_id)),
+            self._indexes.get(self.profile_target(topic)),
+        ) if index]
+        if not indexes:
+            return []
+
+        bounds = sorted({start, end} | {
+            b for index in indexes for b in index.bounds if start < b < end})
+        periods = []
+        for period_start, period_end in zip(bounds, bounds[1:]):
+            override = self.get_active(zone_id, topic, period_start)
+            if override:
+                periods.append((period_start, period_end, override))
+        return periods
+
+    def next_boundary(self, when: datetime) -> Optional[datetime]:
+        """Next point in time at which any override starts or ends."""
+        index = bisect_right(self._bounds, when)
+        return self._bounds[index] if index < len(self._bounds) else None
@@ -0,0 +1,132 @@
+# /config/custom_components/heatzone/runtime.py
+
+from datetime import datetime
+from typing import Optional
+from .window import WindowStateMachine
+from .aggregator import REDUCERS
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+# zone field: entity_id pattern and parser of the state
+ZONE_ENTITY_FIELDS = {
+    "mode": ("select.{}_mode", str),
+    "profile": ("text.{}_profile", str),
+    "manual_temp": ("number.{}_manual_temp", float),
+    "priority": ("number.{}_priority", float),
+    "present": ("switch.{}_present", str),
+    "window_delay": ("number.{}_delay", lambda state: int(float(state))),
+}
+
+def parse_reducer(state: str) -> str:
+    """Name of an aggregator reducer, ValueError for unknown ones."""
+    if state not in REDUCERS:
+        raise ValueError(f"Unknown reducer {state}")
+    return state
+
+
+# global setting: entity_id and parser of the state
+GLOBAL_ENTITY_FIELDS = {
+    "boost_duration": ("number.global_boost_duration", lambda state: int(float(state))),
+    "boost_temp": ("number.global_boost_temp", lambda state: int(float(state))),
+    "hysteresis": ("number.global_hysteresis", float),
+    "window_debounce": ("number.global_window_debounce", lambda state: int(float(state))),
+    "window_min_closed": ("number.global_window_min_closed", lambda state: int(float(state))),
+    "window_max_resends": ("number.global_window_max_resends", lambda state: int(float(state))),
+    "temp_filter_tau": ("number.global_temp_filter_tau", float),
+    "temp_deadband": ("number.global_temp_deadband", float),
+    "temp_min_interval": ("number.global_temp_min_interval", float),
+    "source_max_age": ("number.global_source_max_age", lambda state: int(float(state))),
+    "source_reducer": ("select.global_source_reducer", parse_reducer),
+    "window_reducer": ("select.global_window_reducer", parse_reducer),
+}
+
+
+def parse_state(state: Optional[str], parser, default):
+    """Converts an entity state, default for missing or invalid states."""
+    if state is None or state in ("unknown", "unavailable", ""):
+        return default
+    try:
+        return parser(state)
+    except (ValueError, TypeError):
+        return default
+
+
+class ZoneRuntime:
+    """Runtime state of one zone and the mirrored states of its entities."""
+
+    __slots__ = (
+        "zone_id",
+        # entity states, kept current by state change events
+        "mode", "profile", "manual_temp", "priority", "present", "window_delay",
+        # runtime
+        "current_temp", "last_temp", "window",
+        "boost_active", "boost_until", "boost_temp",
+    )
+
+    DEFAULTS = {
+        "mode": None,
+        "profile": None,
+        "manual_temp": None,
+        "priority": 0.0,
+        "present": None,
+        "window_delay": 10,
+    }
+
+    def __init__(self, zone_id: str):
+        self.zone_id = zone_id
+        for field, default in self.DEFAULTS.items():
+            setattr(self, field, default)
+        self.current_temp: Optional[float] = None
+        self.last_temp: Optional[float] = None      # last sent target temp
+        self.window = WindowStateMachine()
+        self.boost_active = False
+        self.boost_until: Optional[datetime] = None
+        self.boost_temp: Optional[float] = None
+
+    def entity_ids(self) -> dict:
+        """{entity_id: field} of the mirrored entities."""
+        return {pattern.format(self.zone_id): field
+                for field, (pattern, _) in ZONE_ENTITY_FIELDS.items()}
+
+    def set_state(self, field: str, state: Optional[str]):
+        """Stores a converted entity state."""
+        parser = ZONE_ENTITY_FIELDS[field][1]
+        setattr(self, field, parse_state(state, parser, self.DEFAULTS[field]))
+
+
+class GlobalSettings:
+    """Global settings, kept current by state change events."""
+
+    __slots__ = ("boost_duration", "boost_temp", "hysteresis",
+                 "window_debounce", "window_min_closed", "window_max_resends",
+                 "temp_filter_tau", "temp_deadband", "temp_min_interval", "source_max_age",
+                 "source_reducer", "window_reducer")
+
+    DEFAULTS = {
+        "boost_duration": 10,
+        "boost_temp": 25.0,
+        "hysteresis": 0.5,
+        "window_debounce": 5,           # seconds
+        "window_min_closed": 30,        # seconds
+        "window_max_resends": 10,       # per hour and zone, 0 = no cap
+        "temp_filter_tau": 60.0,        # seconds, 0 = no smoothing
+        "temp_deadband": 0.2,           # °C
+        "temp_min_interval": 60.0,      # seconds
+        "source_max_age": 0,            # minutes without update, 0 = never stale
+        "source_reducer": "trimmed",    # temperature/humidity: a faulty sensor does not shift the zone
+        "window_reducer": "max",        # one open contact is enough
+    }
+
+    def __init__(self):
+        for field, default in self.DEFAULTS.items():
+            setattr(self, field, default)
+
+    def entity_ids(self) -> dict:
+        """{entity_id: field} of the global setting entities."""
+        return {entity_id: field for field, (entity_id, _) in GLOBAL_ENTITY_FIELDS.items()}
+
+    def set_state(self, field: str, state: Optional[str]):
+        """Stores a converted entity state."""
+        parser = GLOBAL_ENTITY_FIELDS[field][1]
+        setattr(self, field, parse_state(state, parser, self.DEFAULTS[field]))
@@ -0,0 +1,83 @@
+# /config/custom_components/heatzone/scheduler.py
+
+import heapq
+from datetime import datetime
+from typing import Optional, Dict, Hashable
+
+
+class DeadlineScheduler:
+    """Keeps time boundaries in a heap and reports the earliest one.
+
+    Every boundary is stored under a key (e.g. ("boost", zone_id)) with
+    optional data needed to restore it. Setting a key again replaces its
+    deadline; outdated heap entries are dropped lazily.
+    """
+
+    def __init__(self):
+        self._heap: list = []                           # [(when, seq, key)]
+        self._deadlines: Dict[Hashable, datetime] = {}  # {key: when}
+        self._data: Dict[Hashable, dict] = {}           # {key: data}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def set(self, key: Hashable, when: datetime, data: Optional[dict] = None):
+        """Sets or replaces the deadline for a key."""
+        if data is not None:
+            self._data[key] = data
+        else:
+            self._data.pop(key, None)
+        if self._deadlines.get(key) == when:
+            return
+        self._deadlines[key] = when
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, key))
+
+    def cancel(self, key: Hashable):
+        """Removes the deadline for a key."""
+        self._deadlines.pop(key, None)
+        self._data.pop(key, None)
+
+    def get(self, key: Hashable) -> Optional[datetime]:
+        """Get the deadline for a key."""
+        return self._deadlines.get(key)
+
+    def get_data(self, key: Hashable) -> Optional[dict]:
+        """Get the data stored with a deadline."""
+        return self._data.get(key)
+
+    def items(self) -> list:
+        """All deadlines as [(key, when, data)]."""
+        return [(key, when, self._data.get(key)) for key, when in self._deadlines.items()]
+
+    def clear(self):
+        """Removes all deadlines."""
+        self._heap = []
+        self._deadlines = {}
+        self._data = {}
+
+    def _drop_stale(self):
+        """Removes heap entries whose key was cancelled or rescheduled."""
+        heap = self._heap
+        while heap:
+            when, _, key = heap[0]
+            if self._deadlines.get(key) == when:
+                return
+            heapq.heappop(heap)
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Get the earliest deadline."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list:
+        """Removes and returns all due deadlines as [(key, data)]."""
+        due = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append((key, self._data.pop(key, None)))
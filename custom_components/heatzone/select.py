@@ -6,6 +6,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback, Event
 from homeassistant.helpers.event import async_call_later
 from .entity import ZoneEntityCore
+from .aggregator import REDUCERS
 from .const import *
 
 import logging
@@ -21,6 +22,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry,
     zones = entry.options.get("zones") or entry.data.get("zones", {})
     entities: list[SelectEntity] = []
 
+    entities.append(GlobalSourceReducerSelect(hass, entry))
+    entities.append(GlobalWindowReducerSelect(hass, entry))
+
     for zone_id in zones:
         entities.append(ZoneModeSelect(hass, entry, zone_id))
         entities.append(ZoneWindowSelect(hass, entry, zone_id))
@@ -320,6 +324,9 @@ class ZoneSelectBase(ZoneEntityCore, SelectEntity):
         self._attr_native_value = self._attr_current_option
         self.async_write_ha_state()
 
+    async def async_apply_batch(self, value) -> None:
+        await self.async_select_option(str(value))
+
     async def async_select_option(self, option: str) -> None:
         """Handle option selection - toggle for multi-select, replace for single-select."""
         if option not in self._attr_options:
@@ -396,6 +403,7 @@ class ZoneModeSelect(ZoneSelectBase):
     _attr_name_suffix = "Modus"
     _attr_unique_suffix = "mode"
     _attr_options = HEATER_MODES
+    _batch_field = "mode"
     _attr_default_value = HeaterMode.OFF.value
     _update_temps = True
 
@@ -438,4 +446,28 @@ class ZoneThermostatSelect(ZoneSelectBase):
     _domain_filter = "climate"
     _attr_name_suffix = "Thermostat"
     _attr_unique_suffix = "thermostat_sensor"
-    _attr_allow_multiple = True 
\ No newline at end of file
+    _attr_allow_multiple = True 
+
+# ---------------------------------------------------------------------------
+# ANCHOR - Global reducer selects
+# ---------------------------------------------------------------------------
+
+class GlobalSourceReducerSelect(ZoneSelectBase):
+    """How the values of several temperature or humidity sensors of a zone are combined."""
+
+    _attr_icon = "mdi:sigma"
+    _attr_name_suffix = "Sensor reducer"
+    _attr_unique_suffix = "source_reducer"
+    _attr_options = list(REDUCERS)
+    _attr_default_value = "trimmed"
+    _attr_is_global = True
+
+class GlobalWindowReducerSelect(ZoneSelectBase):
+    """How several window contacts of a zone are combined."""
+
+    _attr_icon = "mdi:sigma"
+    _attr_name_suffix = "Window reducer"
+    _attr_unique_suffix = "window_reducer"
+    _attr_options = list(REDUCERS)
+    _attr_default_value = "max"
+    _attr_is_global = True
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 import json
+import time
 from typing import Optional
 from datetime import datetime
 from homeassistant.const import EVENT_STATE_CHANGED, UnitOfTemperature
@@ -15,6 +16,7 @@ from homeassistant.core import HomeAssistant, callback, Event
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import async_track_state_change_event
 from .entity import ZoneEntityCore, ZoneMirrorEntityBase
+from .temp_filter import TempFilter
 from .const import *
 
 import logging
@@ -32,6 +34,15 @@ async def async_setup_entry(hass: HomeAssistant,entry: ConfigEntry,
 
     # global sensor
     entities.append(GlobalTempDiffSensor(hass, entry))
+    entities.append(GlobalMaxDeficitSensor(hass, entry))
+    entities.append(GlobalDeficitMedianSensor(hass, entry))
+    entities.append(GlobalDeficitP90Sensor(hass, entry))
+    entities.append(GlobalCallingZonesSensor(hass, entry))
+    entities.append(GlobalModulationSensor(hass, entry))
+
+    # heating circuits (on the global device)
+    for circuit_id, circuit in entry.options.get("circuits", {}).items():
+        entities.append(CircuitTempDiffSensor(hass, entry, circuit_id, circuit.get("name", circuit_id)))
 
     for zone_id in zones:
         entities.append(ZoneCurrentTemperatureSensor(hass, entry, zone_id))
@@ -191,13 +202,20 @@ class ZoneTargetTemperatureSensor(ZoneSensorBase):
 class ZoneMirrorSensorBase(ZoneMirrorEntityBase, SensorEntity):
     """Base class for sensors that reflect values from Select."""
 
-    def _get_mirrored_value(self, target_state):
-        return target_state.state
+    _attr_reducer_setting = "source_reducer"
+
+    def _get_mirrored_value(self, value: float):
+        return round(value, 1)
+
+    def _get_source_max_age(self) -> Optional[float]:
+        manager = self._manager
+        max_age = manager.settings.source_max_age if manager else 0
+        return max_age * 60 if max_age > 0 else None
 
     @property
     def native_value(self):
-        target_state = self._get_target_state()
-        return self._get_mirrored_value(target_state) if target_state else None
+        value = self._get_aggregated_value()
+        return self._get_mirrored_value(value) if value is not None else None
 
 # -----------------------------------------------------------------------------
 # ANCHOR - Mirror sensors
@@ -211,7 +229,7 @@ class ZoneCurrentTemperatureSensor(ZoneMirrorSensorBase):
     _attr_native_unit_of_measurement = "°C"
     _attr_icon = "mdi:thermometer"
     _attr_name_suffix = "Actual temperature"
-    _update_temps = True
+    _update_temps = False           # only a changed filtered value, see _update_current_temp
     
     def __init__(self, hass, entry, zone_id):
         super().__init__(hass, entry, zone_id)
@@ -219,29 +237,48 @@ class ZoneCurrentTemperatureSensor(ZoneMirrorSensorBase):
         self._calibrate_entity_id = f"number.{zone_id}_temp_calibrate"
         self._current_climate_entity_id = None
         self._last_sent_temp = None
+        self._current_temp = None       # filtered and calibrated
+        self._filter = TempFilter()
+        self._unsub_refilter = None
     
     @property
     def native_value(self):
-        """Provides current temperature and sends it to the thermostat."""
-        # convert to float
-        try: 
-            temp = float(super().native_value)  # from base class
-        except (TypeError, ValueError):
-            temp = 0.0
+        """Current temperature, filtered and calibrated."""
+        return self._current_temp
+    
+    @callback
+    def _on_sources_changed(self):
+        """A new aggregated value is filtered once, then the state is written."""
+        self._schedule_stale()
+        self._update_current_temp(new_sample=True)
+        self.async_write_ha_state()
+    
+    def _update_current_temp(self, new_sample: bool):
+        """Filters and calibrates the temperature, passes a changed value on.
+
+        new_sample=False only re-checks a held back value (timer, calibration).
+        """
+        value = self._get_aggregated_value()
+        temp = 0.0
+        # smooth noisy sensors before the manager and the thermostat see them
+        if value is not None:
+            temp = self._filter_temp(self._get_mirrored_value(value), new_sample)
         
         # apply calibration offset
         calibration_offset = self._get_calibration_offset()
         calibrated_temp = round(temp + calibration_offset, 1)
         
-        # store current temp in manager (calibrated value)
-        self._manager.zone_current_temp[self._zone_id] = calibrated_temp
+        # store current temp in manager (calibrated value), held back readings
+        # do not recalculate the zone
+        if calibrated_temp != self._current_temp:
+            self._current_temp = calibrated_temp
+            self._manager.set_current_temp(self._zone_id, calibrated_temp)
+            self._manager.request_update(self._zone_id, UPDATE_DEBOUNCE_SECONDS)
         
         # if the temperature has changed, send a message to the thermostat.
         if calibrated_temp and calibrated_temp != self._last_sent_temp:
             self.hass.async_create_task(self._send_external_temperature(calibrated_temp))
             self._last_sent_temp = calibrated_temp
-        
-        return calibrated_temp
     
     def _get_calibration_offset(self):
         """Get the calibration offset from the number entity."""
@@ -256,6 +293,36 @@ class ZoneCurrentTemperatureSensor(ZoneMirrorSensorBase):
         
         return 0.0  # Default: no calibration
     
+    def _filter_temp(self, temp: float, new_sample: bool) -> float:
+        """EMA, deadband and minimum send interval from the global settings."""
+        settings = self._manager.settings
+        now = time.monotonic()
+        if new_sample or self._filter.raw is None:
+            value = self._filter.update(temp, now, settings.temp_filter_tau,
+                                        settings.temp_deadband, settings.temp_min_interval)
+        else:
+            value = self._filter.release(now, settings.temp_filter_tau,
+                                         settings.temp_deadband, settings.temp_min_interval)
+        
+        # held back: look again later, so the last value is not lost
+        if not self._filter.is_settled(temp, settings.temp_deadband) and not self._unsub_refilter:
+            wait = max(1.0, settings.temp_filter_tau,
+                       settings.temp_min_interval - (now - self._filter.sent_at))
+            self._unsub_refilter = async_call_later(self.hass, wait, self._refilter)
+        return value
+    
+    @callback
+    def _refilter(self, _now):
+        self._unsub_refilter = None
+        self._update_current_temp(new_sample=False)
+        self.async_write_ha_state()
+    
+    async def async_will_remove_from_hass(self) -> None:
+        if self._unsub_refilter:
+            self._unsub_refilter()
+            self._unsub_refilter = None
+        await super().async_will_remove_from_hass()
+    
     
     async def async_added_to_hass(self) -> None:
         """Setup with thermostat listener."""
@@ -279,6 +346,7 @@ class ZoneCurrentTemperatureSensor(ZoneMirrorSensorBase):
             if event.data.get("entity_id") != self._calibrate_entity_id:
                 return
             _LOGGER.debug("Calibrate Updated")
+            self._update_current_temp(new_sample=False)
             self.async_write_ha_state()
 
         self._unsub_calibrate = async_track_state_change_event(
@@ -482,4 +550,153 @@ class GlobalTempDiffSensor(ZoneSensorBase):
           
     async def _change_mode_boiler(self, temperature: float) -> None:
         """ChangeMode Boiler."""     
-        
\ No newline at end of file
+        
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Global demand sensors (computed by the demand engine)
+# -----------------------------------------------------------------------------
+
+class GlobalDemandSensorBase(ZoneSensorBase):
+    """Global sensor for one figure of the demand engine."""
+
+    _attr_is_global = True
+    _attr_should_poll = False
+    _demand_key: str = ""
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+
+        if self._manager:
+            self._attr_native_value = self._manager.global_group.stats.get(self._demand_key)
+            self.async_write_ha_state()
+
+        self._unsub = async_dispatcher_connect(
+            self.hass,
+            f"{DOMAIN}_demand_update",
+            self._handle_demand
+        )
+
+    async def async_will_remove_from_hass(self):
+        """cleanup if entity is removed."""
+        if getattr(self, "_unsub", None):
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _handle_demand(self, stats: dict):
+        value = stats.get(self._demand_key)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+class GlobalMaxDeficitSensor(GlobalDemandSensorBase):
+    """Largest temperature deficit of all zones."""
+
+    _attr_unique_suffix = "max_deficit"
+    _attr_name_suffix = "Max Deficit"
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:thermometer-chevron-up"
+    _demand_key = "max_deficit"
+
+class GlobalDeficitMedianSensor(GlobalDemandSensorBase):
+    """Median temperature deficit of all zones."""
+
+    _attr_unique_suffix = "deficit_p50"
+    _attr_name_suffix = "Deficit Median"
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:thermometer"
+    _demand_key = "deficit_p50"
+
+class GlobalDeficitP90Sensor(GlobalDemandSensorBase):
+    """90th percentile of the temperature deficits."""
+
+    _attr_unique_suffix = "deficit_p90"
+    _attr_name_suffix = "Deficit P90"
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:thermometer-high"
+    _demand_key = "deficit_p90"
+
+class GlobalCallingZonesSensor(GlobalDemandSensorBase):
+    """Number of zones below their target temperature."""
+
+    _attr_unique_suffix = "calling_zones"
+    _attr_name_suffix = "Calling Zones"
+    _attr_icon = "mdi:radiator"
+    _demand_key = "calling_zones"
+
+class GlobalModulationSensor(GlobalDemandSensorBase):
+    """Modulation demand 0-100 % for modulating boilers."""
+
+    _attr_unique_suffix = "modulation"
+    _attr_name_suffix = "Modulation"
+    _attr_native_unit_of_measurement = "%"
+    _attr_icon = "mdi:fire-circle"
+    _demand_key = "modulation"
+
+# -----------------------------------------------------------------------------
+# ANCHOR - Heating circuit sensors
+# -----------------------------------------------------------------------------
+
+class CircuitTempDiffSensor(ZoneSensorBase):
+    """Weighted temperature difference of the zones of one heating circuit."""
+
+    _attr_is_global = True
+    _attr_use_translation = False
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:thermometer-alert"
+
+    def __init__(self, hass, entry, circuit_id: str, circuit_name: str):
+        self._circuit_id = circuit_id
+        self._attr_unique_suffix = f"circuit_{circuit_id}_temp_diff"
+        self._attr_name_suffix = f"{circuit_name} Temperature Difference"
+        super().__init__(hass, entry)
+        self._unsub = None
+
+    def _get_circuit(self):
+        return self._manager.circuits.get(self._circuit_id) if self._manager else None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+
+        circuit = self._get_circuit()
+        self._attr_native_value = circuit.temp_diff if circuit else None
+        self.async_write_ha_state()
+
+        self._unsub = async_dispatcher_connect(
+            self.hass,
+            f"{DOMAIN}_circuit_update_{self._circuit_id}",
+            self._handle_update
+        )
+
+    async def async_will_remove_from_hass(self):
+        """cleanup if entity is removed."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _handle_update(self):
+        circuit = self._get_circuit()
+        if circuit:
+            self._attr_native_value = circuit.temp_diff
+            self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Demand figures and the contribution of every zone of the circuit."""
+        circuit = self._get_circuit()
+        if not circuit:
+            return {}
+        return {
+            **circuit.stats,
+            "hysteresis": circuit.hysteresis,
+            "zones": {
+                zone_id: {"priority": prio, "diff": round(diff, 1), "weighted": round(prio * diff, 1)}
+                for zone_id, (prio, diff) in circuit.contributions.items()
+            },
+        }
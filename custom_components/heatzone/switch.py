@@ -52,6 +52,12 @@ class ZoneSwitchBase(ZoneEntityCore, SwitchEntity):
             self._attr_is_on = last_state.state == "on"
             _LOGGER.debug(f"Restored {self.entity_id} to {self._attr_is_on}")
 
+    async def async_apply_batch(self, value) -> None:
+        if value:
+            await self.async_turn_on()
+        else:
+            await self.async_turn_off()
+
 # -----------------------------------------------------------------------------
 # ANCHOR - Zone present switch
 # -----------------------------------------------------------------------------
@@ -61,6 +67,7 @@ class ZonePresentSwitch(ZoneSwitchBase):
     _attr_icon = "mdi:radiator"
     _attr_unique_suffix = "present"
     _attr_name_suffix = "Present"
+    _batch_field = "present"
     _default_present = True
     _update_temps = True
 
@@ -83,6 +90,7 @@ class ZoneBoostSwitch(ZoneSwitchBase):
     _attr_icon = "mdi:fire"
     _attr_unique_suffix = "boost"
     _attr_name_suffix = "Boost"
+    _batch_field = "boost"
     _update_temps = True
 
     def __init__(self, hass, entry, zone_id):
@@ -0,0 +1,73 @@
+# /config/custom_components/heatzone/temp_filter.py
+
+import math
+from typing import Optional
+
+import logging
+_LOGGER = logging.getLogger(__name__)
+
+
+class TempFilter:
+    """Input filter of one zone temperature: EMA, deadband and minimum send interval.
+
+    The EMA weight depends on the time since the last sample, so a value
+    after a long quiet period passes almost directly while bursts of a
+    noisy sensor are smoothed. Times are monotonic seconds.
+    """
+
+    __slots__ = ("raw", "value", "updated_at", "output", "sent_at", "suppressed")
+
+    def __init__(self):
+        self.raw: Optional[float] = None        # last raw sample
+        self.value: Optional[float] = None      # smoothed value
+        self.updated_at = 0.0
+        self.output: Optional[float] = None     # last value passed on
+        self.sent_at = 0.0
+        self.suppressed = 0                     # samples held back
+
+    def update(self, raw: float, now: float, tau: float, deadband: float,
+               min_interval: float) -> float:
+        """Feed a raw sample, returns the value to pass on."""
+        self.raw = raw
+        self._smooth(now, tau)
+        if not self._pass_on(now, deadband, min_interval):
+            self.suppressed += 1
+        return self.output
+
+    def release(self, now: float, tau: float, deadband: float,
+                min_interval: float) -> Optional[float]:
+        """Checks a held back value again without a new sample.
+
+        The smoothed value follows the last raw sample for the elapsed time,
+        as the sensor has not reported anything else since.
+        """
+        if self.raw is not None:
+            self._smooth(now, tau)
+            self._pass_on(now, deadband, min_interval)
+        return self.output
+
+    def _smooth(self, now: float, tau: float):
+        if self.value is None or tau <= 0:
+            self.value = self.raw
+        else:
+            alpha = 1.0 - math.exp(-max(0.0, now - self.updated_at) / tau)
+            self.value += alpha * (self.raw - self.value)
+        self.updated_at = now
+
+    def _pass_on(self, now: float, deadband: float, min_interval: float) -> bool:
+        """Passes the smoothed value on, False if deadband or interval hold it back."""
+        value = round(self.value, 1)
+        if self.output is not None and value != self.output:
+            if abs(value - self.output) < deadband or now - self.sent_at < min_interval:
+                return False
+
+        if value != self.output:
+            self.output = value
+            self.sent_at = now
+        return True
+
+    def is_settled(self, raw: float, deadband: float) -> bool:
+        """The passed on value follows the raw value (within the deadband)."""
+        if self.output is None:
+            return True
+        return abs(round(raw, 1) - self.output) < max(deadband, 0.1)
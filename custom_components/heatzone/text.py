@@ -40,6 +40,9 @@ class ZoneTextBase(ZoneEntityCore, TextEntity):
         self.async_write_ha_state()
         _LOGGER.debug(f"Updated {self.entity_id} text to {value}")
 
+    async def async_apply_batch(self, value) -> None:
+        await self.async_set_value(str(value))
+
 # ---------------------------------------------------------------------------
 # ANCHOR - Zone texts
 # ---------------------------------------------------------------------------
@@ -51,6 +54,7 @@ class ZoneProfileText(ZoneTextBase):
     _attr_name_suffix = "Profile"
     _attr_unique_suffix = "profile"
     _attr_default_value = "Default"
+    _batch_field = "profile"
     _update_temps = True
 
 
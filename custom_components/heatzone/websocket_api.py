@@ -14,6 +14,9 @@ async def async_setup_ws_api(hass):
     """Register HeatZone WebSocket API commands."""
     _LOGGER.debug("Registering HeatZone WebSocket command...")
     websocket_api.async_register_command(hass, handle_get_private_config)
+    websocket_api.async_register_command(hass, handle_get_stats)
+    websocket_api.async_register_command(hass, handle_get_timeline)
+    websocket_api.async_register_command(hass, handle_estimate)
     _LOGGER.info("HeatZone WebSocket command registered successfully.")
 
 # --------------------------------------------------------------------
@@ -44,3 +47,73 @@ async def handle_get_private_config(hass, connection, msg):
 
     _LOGGER.debug("Sending MQTT config to frontend: %s", mqtt_config)
     connection.send_result(msg["id"], mqtt_config)
+
+
+def _get_manager(hass):
+    """Get the profile manager of the config entry."""
+    entry = next(iter(hass.config_entries.async_entries("heatzone")), None)
+    if not entry:
+        return None
+    return hass.data.get("heatzone", {}).get(entry.entry_id, {}).get("profile_manager")
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "heatzone/get_stats"
+    })
+
+@websocket_api.async_response
+async def handle_get_stats(hass, connection, msg):
+    """Send diagnostic counters of the profile manager."""
+    manager = _get_manager(hass)
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Profile manager not running.")
+        return
+
+    connection.send_result(msg["id"], manager.get_stats())
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "heatzone/get_timeline",
+    vol.Optional("days", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=7)),
+    })
+
+@websocket_api.async_response
+async def handle_get_timeline(hass, connection, msg):
+    """Send projected target temperatures of all zones as [timestamp, temp] change points."""
+    manager = _get_manager(hass)
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Profile manager not running.")
+        return
+
+    connection.send_result(msg["id"], manager.get_timeline(msg["days"]))
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "heatzone/estimate",
+    vol.Required("candidates"): vol.All([{
+        vol.Optional("name"): str,
+        vol.Optional("profile"): str,
+        vol.Optional("data"): {str: vol.Any(str, int, float, list)},
+        vol.Optional("zones"): [str],
+    }], vol.Length(min=1)),
+    vol.Optional("year"): vol.All(vol.Coerce(int), vol.Range(min=2000, max=2100)),
+    })
+
+@websocket_api.async_response
+async def handle_estimate(hass, connection, msg):
+    """Send annual setpoint-hours per zone and priority for one or more schedules."""
+    manager = _get_manager(hass)
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Profile manager not running.")
+        return
+
+    try:
+        result = await manager.estimate(msg["candidates"], msg.get("year"))
+    except ValueError as e:
+        connection.send_error(msg["id"], "invalid_format", str(e))
+        return
+    except ImportError:
+        connection.send_error(msg["id"], "not_supported", "NumPy is not installed.")
+        return
+
+    connection.send_result(msg["id"], result)
@@ -0,0 +1,100 @@
+# /config/custom_components/heatzone/window.py
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+from .const import *
+
+
+class WindowStateMachine:
+    """Window state of one zone: debounce, lockout, minimum closed time, re-send cap.
+
+    report() takes the raw contact state, on_deadline() is called when
+    self.deadline has passed. Both return True if the zone has to be
+    recalculated, i.e. 0°C has to be sent or the normal temp restored.
+    """
+
+    __slots__ = ("state", "deadline", "resends", "suppressed")
+
+    def __init__(self):
+        self.state = WindowState.CLOSED
+        self.deadline: Optional[datetime] = None
+        self.resends: deque = deque()   # times of sent window changes
+        self.suppressed = 0             # ignored flaps and deferred re-sends
+
+    @property
+    def applied(self) -> bool:
+        """0°C is active for the zone."""
+        return self.state in (WindowState.APPLIED, WindowState.CLOSING)
+
+    def _set(self, state: WindowState, deadline: Optional[datetime] = None):
+        self.state = state
+        self.deadline = deadline
+
+    def report(self, is_open: bool, now: datetime, delay: int, settings) -> bool:
+        """Raw contact state of the window sensor, repeated states are ignored."""
+        state = self.state
+        if is_open:
+            if state == WindowState.CLOSED:
+                self._set(WindowState.OPENING, now + timedelta(seconds=settings.window_debounce))
+                if settings.window_debounce <= 0:
+                    return self._open(now, delay, settings)
+            elif state == WindowState.CLOSING:
+                # reopened within the minimum closed time, 0°C stays
+                self._set(WindowState.APPLIED)
+                self.suppressed += 1
+            return False
+
+        if state == WindowState.OPENING:
+            # bounce, the open never counted
+            self._set(WindowState.CLOSED)
+            self.suppressed += 1
+        elif state == WindowState.OPEN:
+            # closed during the lockout, nothing was sent
+            self._set(WindowState.CLOSED)
+        elif state == WindowState.APPLIED:
+            hold = max(settings.window_debounce, settings.window_min_closed)
+            self._set(WindowState.CLOSING, now + timedelta(seconds=hold))
+            if hold <= 0:
+                return self._send(WindowState.CLOSED, now, settings)
+        return False
+
+    def on_deadline(self, now: datetime, delay: int, settings) -> bool:
+        """Debounce, lockout or minimum closed time has passed."""
+        if self.state == WindowState.OPENING:
+            return self._open(now, delay, settings)
+        if self.state == WindowState.OPEN:
+            return self._send(WindowState.APPLIED, now, settings)
+        if self.state == WindowState.CLOSING:
+            return self._send(WindowState.CLOSED, now, settings)
+        self.deadline = None
+        return False
+
+    def _open(self, now: datetime, delay: int, settings) -> bool:
+        """Open confirmed, 0°C after the lockout."""
+        if delay <= 0:
+            return self._send(WindowState.APPLIED, now, settings)
+        self._set(WindowState.OPEN, now + timedelta(minutes=delay))
+        return False
+
+    def _send(self, state: WindowState, now: datetime, settings) -> bool:
+        """Change the sent temp, or defer it while the re-send cap is reached."""
+        resends = self.resends
+        since = now - timedelta(seconds=WINDOW_RESEND_PERIOD_SECONDS)
+        while resends and resends[0] <= since:
+            resends.popleft()
+
+        cap = settings.window_max_resends
+        if cap > 0 and len(resends) >= cap:
+            # keep the current state until the oldest re-send leaves the period
+            self.deadline = resends[0] + timedelta(seconds=WINDOW_RESEND_PERIOD_SECONDS)
+            self.suppressed += 1
+            return False
+
+        resends.append(now)
+        self._set(state)
+        return True
+
+    def restore(self, state: str, deadline: datetime):
+        """State with a pending deadline after a restart."""
+        self._set(WindowState(state), deadline)